@@ -0,0 +1,57 @@
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Request, status
+from jose import JWTError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.principal import (
+    AuthenticatedUser, principal_cache, token_state_cache,
+    load_principal, load_token_state, principal_from_claims
+)
+from app.core.security import decode_access_token
+from app.database.session import get_read_db
+
+async def get_current_user(request: Request, db: AsyncSession = Depends(get_read_db)) -> AuthenticatedUser:
+    token = request.cookies.get("access_token")
+    if not token:
+        # Fallback to header for API testing tools
+        auth_header = request.headers.get("Authorization")
+        if auth_header and auth_header.startswith("Bearer "):
+            token = auth_header.split(" ")[1]
+    
+    if not token:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+
+    try:
+        payload = decode_access_token(token)
+        username: Optional[str] = payload.get("sub")
+        if username is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    except JWTError:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+    # Tokens with signed claims are trusted as long as their version matches the
+    # user's current token_version (a tiny PK lookup, cached per user)
+    principal = principal_from_claims(payload)
+    if principal is not None:
+        state = token_state_cache.get(principal.id) or await load_token_state(db, principal.id)
+        if state is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+        if not state.is_active:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Inactive user")
+        if state.token_version == principal.token_version:
+            return principal
+        # Version mismatch: the claims are stale, fall back to the database
+
+    # 'sub' is the local UserIdentity.subject (the username). Hot tokens are served
+    # from the principal cache; ORM writes to User/UserIdentity invalidate it.
+    principal = principal_cache.get(username)
+    if principal is None:
+        principal = await load_principal(db, username)
+        if principal is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+        principal_cache.set(username, principal)
+
+    if not principal.is_active:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Inactive user")
+    return principal
@@ -0,0 +1,99 @@
+import csv
+import io
+import json
+import os
+import zlib
+from typing import AsyncIterator, Callable, List, Optional, Sequence, Type
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from prometheus_client import Counter
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.serialization import row_adapter
+
+# Configuration
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "1000"))  # Rows per cursor fetch and response chunk
+EXPORT_GZIP_LEVEL = int(os.getenv("EXPORT_GZIP_LEVEL", "6"))
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# Metrics
+EXPORT_ROWS = Counter(
+    "ez4u_export_rows_total",
+    "Rows written by streamed exports",
+    ["export", "format"],
+)
+
+async def cursor_chunks(db: AsyncSession, stmt) -> AsyncIterator[List[dict]]:
+    # yield_per streams from a server-side cursor on Postgres, so only one chunk
+    # of rows is in memory however large the export is
+    result = await db.stream(stmt.execution_options(yield_per=EXPORT_CHUNK_SIZE))
+    async for partition in result.partitions():
+        yield [dict(row._mapping) for row in partition]
+
+def accepts_gzip(request: Request) -> bool:
+    for coding in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = coding.partition(";")
+        if name.strip().lower() in ("gzip", "x-gzip"):
+            quality = params.strip().removeprefix("q=")
+            try:
+                return not quality or float(quality) > 0
+            except ValueError:
+                return False
+    return False
+
+async def gzipped(pieces: AsyncIterator[bytes], level: int = EXPORT_GZIP_LEVEL) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31: gzip container
+    async for piece in pieces:
+        # Sync flush per chunk, so clients can decompress the export as it arrives
+        yield compressor.compress(piece) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+def csv_cell(value) -> str:
+    # Values are already JSON-mode dumps: strings as-is, everything else as JSON
+    if value is None:
+        return ""
+    return value if isinstance(value, str) else json.dumps(value)
+
+def export_response(
+    request: Request,
+    name: str,
+    format: str,
+    chunks: AsyncIterator[List[dict]],
+    model: Type[BaseModel],
+    csv_columns: Sequence[str],
+    csv_row: Optional[Callable[[dict], dict]] = None,
+) -> StreamingResponse:
+    # NDJSON lines are the model's JSON; CSV rows the listed columns of it,
+    # after csv_row flattens anything nested
+    adapter = row_adapter(model)
+
+    async def encoded() -> AsyncIterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if format == "csv":
+            writer.writerow(csv_columns)
+        async for rows in chunks:
+            if format == "ndjson":
+                yield b"".join(adapter.dump_json(row) + b"\n" for row in rows)
+            else:
+                for row in rows:
+                    values = adapter.dump_python(row, mode="json")
+                    if csv_row is not None:
+                        values = csv_row(values)
+                    writer.writerow([csv_cell(values.get(column)) for column in csv_columns])
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+            EXPORT_ROWS.labels(name, format).inc(len(rows))
+        if buffer.tell():
+            yield buffer.getvalue().encode()  # Header of an empty CSV export
+
+    headers = {"Content-Disposition": f'attachment; filename="{name}.{format}"', "Vary": "Accept-Encoding"}
+    body = encoded()
+    if accepts_gzip(request):
+        headers["Content-Encoding"] = "gzip"
+        body = gzipped(body)
+    return StreamingResponse(body, media_type=EXPORT_MEDIA_TYPES[format], headers=headers)
@@ -0,0 +1,127 @@
+import json
+import operator
+import re
+from typing import Any, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import and_, cast, func, not_, select, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB, JSONPATH
+
+MAX_DATA_FILTERS = 10
+
+# A dotted key path, then optionally an operator and a value:
+# status=active, specs.size>=10, tags=["red"], owner (the key exists)
+_FILTER = re.compile(r"^(?P<path>[\w-]+(?:\.[\w-]+)*)(?:(?P<op>!=|>=|<=|=|>|<)(?P<value>.*))?$")
+_COMPARISONS = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge}
+
+class DataFilter(BaseModel):
+    """One condition on a JSON column: ``path op value``, or ``path`` alone for "the key exists"."""
+
+    path: Tuple[str, ...]
+    op: Optional[str] = None
+    value: Any = None
+
+    model_config = ConfigDict(frozen=True)
+
+def _reject_constant(name: str):
+    raise ValueError(name)  # NaN/Infinity aren't JSON; they're taken as strings
+
+def parse_data_filters(filters: List[str]) -> List[DataFilter]:
+    # Values are JSON when they parse as JSON (10, true, null, ["a"], "10"), else plain strings
+    if len(filters) > MAX_DATA_FILTERS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"At most {MAX_DATA_FILTERS} filters")
+    parsed = []
+    for text in filters:
+        match = _FILTER.match(text.strip())
+        if match is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid filter: {text!r}")
+        op, value = match["op"], None
+        if op is not None:
+            try:
+                value = json.loads(match["value"], parse_constant=_reject_constant)
+            except ValueError:
+                value = match["value"]
+            if op in _COMPARISONS and (isinstance(value, bool) or not isinstance(value, (int, float, str))):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Invalid filter: {text!r} ({op} compares numbers or strings)",
+                )
+        parsed.append(DataFilter(path=tuple(match["path"].split(".")), op=op, value=value))
+    return parsed
+
+def _json_path(path: Tuple[str, ...]) -> str:
+    # $."specs"."size": quoted keys read the same in SQL/JSON path and SQLite's JSON paths
+    return "$" + "".join(f".{json.dumps(key, ensure_ascii=False)}" for key in path)
+
+def _nested(path: Tuple[str, ...], value: Any) -> Any:
+    for key in reversed(path):
+        value = {key: value}
+    return value
+
+# ----------------------------------------------------------------------
+# POSTGRES
+# Everything compiles to jsonb operators the GIN index serves: = is @>
+# containment, key existence and comparisons are @? path queries.
+# ----------------------------------------------------------------------
+
+def _postgres_clause(column, data_filter: DataFilter):
+    data = type_coerce(column, JSONB)
+    path = _json_path(data_filter.path)
+    if data_filter.op is None:
+        return data.op("@?")(cast(path, JSONPATH))
+    if data_filter.op in ("=", "!="):
+        return data.contains(_nested(data_filter.path, data_filter.value))
+    # Lax mode skips values of another type instead of raising, like the SQLite fallback
+    return data.op("@?")(cast(f"{path} ? (@ {data_filter.op} {json.dumps(data_filter.value)})", JSONPATH))
+
+# ----------------------------------------------------------------------
+# SQLITE FALLBACK
+# Same semantics through json_type/json_extract/json_each, evaluated per
+# row. Containment of objects nested inside arrays needs Postgres.
+# ----------------------------------------------------------------------
+
+def _scalar_matches(extracted, json_type, value):
+    if value is None:
+        return json_type == "null"
+    if isinstance(value, bool):
+        return json_type == ("true" if value else "false")
+    if isinstance(value, str):
+        return and_(json_type == "text", extracted == value)
+    return and_(json_type.in_(("integer", "real")), extracted == value)
+
+def _sqlite_contains(column, path: Tuple[str, ...], value: Any):
+    json_path = _json_path(path)
+    json_type = func.json_type(column, json_path)
+    if isinstance(value, dict):
+        return and_(json_type == "object", *(_sqlite_contains(column, path + (key,), item) for key, item in value.items()))
+    if isinstance(value, list):
+        conditions = [json_type == "array"]
+        for item in value:
+            if isinstance(item, (dict, list)):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Filtering on objects or arrays inside arrays requires PostgreSQL",
+                )
+            elements = func.json_each(column, json_path).table_valued("value", "type")
+            conditions.append(select(1).select_from(elements).where(_scalar_matches(elements.c.value, elements.c.type, item)).exists())
+        return and_(*conditions)
+    return _scalar_matches(func.json_extract(column, json_path), json_type, value)
+
+def _sqlite_clause(column, data_filter: DataFilter):
+    json_path = _json_path(data_filter.path)
+    json_type = func.json_type(column, json_path)
+    if data_filter.op is None:
+        return json_type.is_not(None)
+    if data_filter.op in ("=", "!="):
+        return _sqlite_contains(column, data_filter.path, data_filter.value)
+    compare = _COMPARISONS[data_filter.op]
+    types = ("text",) if isinstance(data_filter.value, str) else ("integer", "real")
+    return and_(json_type.in_(types), compare(func.json_extract(column, json_path), data_filter.value))
+
+def data_filter_clause(column, data_filter: DataFilter, dialect: str):
+    clause = (_postgres_clause if dialect == "postgresql" else _sqlite_clause)(column, data_filter)
+    if data_filter.op == "!=":
+        # Rows without the key (or without data) are "not equal" too
+        return not_(func.coalesce(clause, False))
+    return clause
@@ -0,0 +1,116 @@
+import asyncio
+import contextvars
+import functools
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from opentelemetry import trace
+from prometheus_client import Counter, Gauge, Histogram
+
+from app.core.security import verify_password, get_password_hash
+
+# Configuration
+# "thread" works well because argon2-cffi releases the GIL while hashing;
+# "process" isolates hashing completely at the cost of pickling per call.
+HASH_POOL_KIND = os.getenv("HASH_POOL_KIND", "thread").lower()
+HASH_POOL_WORKERS = int(os.getenv("HASH_POOL_WORKERS", str(os.cpu_count() or 1)))
+# Calls allowed to wait for a free worker before new ones are rejected
+HASH_QUEUE_LIMIT = int(os.getenv("HASH_QUEUE_LIMIT", "64"))
+HASH_RETRY_AFTER_SECONDS = 1
+
+# Metrics
+HASH_QUEUE_WAIT = Histogram(
+    "ez4u_password_hash_queue_wait_seconds",
+    "Time a password hash/verify call waited for a free worker",
+    ["operation"],
+)
+HASH_DURATION = Histogram(
+    "ez4u_password_hash_duration_seconds",
+    "Time spent inside argon2 for a password hash/verify call",
+    ["operation"],
+)
+HASH_REJECTED = Counter(
+    "ez4u_password_hash_rejected_total",
+    "Password hash/verify calls rejected because the queue was full",
+    ["operation"],
+)
+HASH_PENDING = Gauge(
+    "ez4u_password_hash_pending",
+    "Password hash/verify calls running or waiting in the pool",
+)
+
+tracer = trace.get_tracer("ez4u.hashing")
+
+class HashPoolSaturated(Exception):
+    """Raised when the hashing queue is full; callers should answer 503."""
+
+def _timed_call(func: Callable[..., Any], *args: Any) -> tuple[Any, float]:
+    # Runs inside the worker so the measured time excludes queueing
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+class PasswordHashPool:
+    def __init__(self, kind: str = HASH_POOL_KIND, workers: int = HASH_POOL_WORKERS, queue_limit: int = HASH_QUEUE_LIMIT):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown HASH_POOL_KIND: {kind!r}")
+        self.kind = kind
+        self.workers = max(1, workers)
+        self.queue_limit = max(0, queue_limit)
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _get_executor(self) -> Executor:
+        # Created lazily so importing this module never forks worker processes
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+        return self._executor
+
+    async def run(self, operation: str, func: Callable[..., Any], *args: Any) -> Any:
+        # Only touched from the event loop thread, so a plain int is safe
+        if self._pending >= self.workers + self.queue_limit:
+            HASH_REJECTED.labels(operation).inc()
+            raise HashPoolSaturated(f"Password hashing queue is full ({self._pending} pending)")
+
+        self._pending += 1
+        HASH_PENDING.inc()
+        with tracer.start_as_current_span(f"password_hash_pool.{operation}", attributes={"pool.kind": self.kind}) as span:
+            call = functools.partial(_timed_call, func, *args)
+            if self.kind == "thread":
+                # Threads can carry the trace context into the worker; processes can't
+                call = functools.partial(contextvars.copy_context().run, call)
+            submitted = time.perf_counter()
+            try:
+                loop = asyncio.get_running_loop()
+                result, hash_seconds = await loop.run_in_executor(self._get_executor(), call)
+            finally:
+                self._pending -= 1
+                HASH_PENDING.dec()
+
+            queue_wait = max(time.perf_counter() - submitted - hash_seconds, 0.0)
+            span.set_attribute("pool.queue_wait_seconds", queue_wait)
+        HASH_DURATION.labels(operation).observe(hash_seconds)
+        HASH_QUEUE_WAIT.labels(operation).observe(queue_wait)
+        return result
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+password_hash_pool = PasswordHashPool()
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_hash_pool.run("verify", verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    return await password_hash_pool.run("hash", get_password_hash, password)
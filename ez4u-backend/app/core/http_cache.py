@@ -0,0 +1,72 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Dict, Iterable, Optional, Tuple
+from uuid import UUID
+
+from fastapi import Request, Response, status
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Clients may store listings but must revalidate every time; without this,
+# browsers derive heuristic freshness from Last-Modified and stop polling us
+LIST_CACHE_CONTROL = "private, no-cache"
+
+class ListValidators(BaseModel):
+    """ETag/Last-Modified of one listing response, computed without loading it."""
+
+    etag: str
+    last_modified: Optional[datetime] = None
+
+    model_config = ConfigDict(frozen=True)
+
+    def headers(self) -> Dict[str, str]:
+        headers = {"ETag": self.etag, "Cache-Control": LIST_CACHE_CONTROL}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        return headers
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+def list_validators(pairs: Iterable[Tuple[UUID, Optional[datetime]]]) -> ListValidators:
+    # (id, updated_at) of exactly the rows the listing returns. Hashing the
+    # pairs, not just max(updated_at) and the count, also catches a row leaving
+    # a full page (deleted, or no longer matching a filter). Sorted, so the
+    # ETag doesn't depend on the order rows come back in.
+    pairs = sorted((row_id, _as_utc(updated_at) if updated_at is not None else None) for row_id, updated_at in pairs)
+    digest = hashlib.blake2b(digest_size=16)
+    for row_id, updated_at in pairs:
+        digest.update(row_id.bytes)
+        digest.update(updated_at.isoformat().encode() if updated_at is not None else b"-")
+    last_modified = max((updated_at for _, updated_at in pairs if updated_at is not None), default=None)
+    # Weak: equal ETags mean the same rows, not byte-identical bodies
+    return ListValidators(
+        etag=f'W/"{len(pairs)}-{digest.hexdigest()}"',
+        last_modified=last_modified.replace(microsecond=0) if last_modified is not None else None,
+    )
+
+async def query_validators(db: AsyncSession, stmt) -> ListValidators:
+    # stmt selects (id, updated_at) of the listing's rows: an index range scan
+    # instead of loading, validating and serialising them
+    return list_validators((await db.execute(stmt)).all())
+
+def revalidating(request: Request) -> bool:
+    # Only clients holding an ETag need the validators before the listing itself
+    return "if-none-match" in request.headers
+
+def etag_matches(request: Request, etag: str) -> bool:
+    # Weak comparison, as If-None-Match requires
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+def not_modified(request: Request, validators: ListValidators) -> Optional[Response]:
+    # Only If-None-Match is evaluated: Last-Modified can't see deletions, so
+    # If-Modified-Since could answer 304 for a listing that lost rows
+    if etag_matches(request, validators.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validators.headers())
+    return None
@@ -0,0 +1,193 @@
+import os
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+from uuid import UUID
+
+from fastapi import Depends, HTTPException, Request, status
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import DateTime, cast, event, null, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from app.core.authentication import get_current_user
+from app.core.cache import TTLCache
+from app.core.principal import AuthenticatedUser
+from app.database.models import (
+    Permission, Role, TenantMember, GlobalRole, UserGlobalRole,
+    role_permissions, global_role_permissions
+)
+from app.core.tenancy import request_tenant_id
+from app.database.session import get_read_db
+
+# Configuration
+PERMISSION_CACHE_SIZE = int(os.getenv("PERMISSION_CACHE_SIZE", "50000"))
+PERMISSION_CACHE_TTL_SECONDS = float(os.getenv("PERMISSION_CACHE_TTL_SECONDS", "300"))
+
+class PermissionRegistry:
+    """Assigns every permission name a bit so a permission set is a single int."""
+
+    def __init__(self, names_by_id: dict[UUID, str]):
+        self.bits = {name: 1 << index for index, name in enumerate(sorted(set(names_by_id.values())))}
+        self.bits_by_id = {permission_id: self.bits[name] for permission_id, name in names_by_id.items()}
+
+    def mask(self, names: Iterable[str]) -> int:
+        mask = 0
+        for name in names:
+            mask |= self.bits.get(name, 0)
+        return mask
+
+    def names(self, mask: int) -> list[str]:
+        return [name for name, bit in self.bits.items() if mask & bit]
+
+class EffectivePermissions(BaseModel):
+    mask: int
+    # Earliest UserGlobalRole.expires_at that contributed bits; the entry is stale after it
+    valid_until: Optional[datetime] = None
+
+    model_config = ConfigDict(frozen=True)
+
+    def is_valid(self, now: datetime) -> bool:
+        return self.valid_until is None or now < self.valid_until
+
+_registry: Optional[PermissionRegistry] = None
+# Keyed by (user_id, tenant_id); tenant_id None means global roles only
+permission_cache: TTLCache[EffectivePermissions] = TTLCache(PERMISSION_CACHE_SIZE, PERMISSION_CACHE_TTL_SECONDS)
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+def invalidate_permissions(user_id: Optional[UUID] = None, tenant_id: Optional[UUID] = None) -> None:
+    if user_id is None and tenant_id is None:
+        permission_cache.clear()
+        return
+    permission_cache.invalidate_where(
+        lambda key, _: (user_id is None or key[0] == user_id) and (tenant_id is None or key[1] == tenant_id)
+    )
+
+def reset_permission_registry() -> None:
+    global _registry
+    _registry = None
+    # Bits are positional, so masks built with the old registry are meaningless
+    permission_cache.clear()
+
+async def get_permission_registry(db: AsyncSession) -> PermissionRegistry:
+    global _registry
+    if _registry is None:
+        result = await db.execute(select(Permission.id, Permission.name))
+        _registry = PermissionRegistry({row.id: row.name for row in result})
+    return _registry
+
+async def load_effective_permissions(db: AsyncSession, user_id: UUID, tenant_id: Optional[UUID]) -> EffectivePermissions:
+    registry = await get_permission_registry(db)
+
+    # Global role grants apply in every tenant
+    global_grants = (
+        select(global_role_permissions.c.permission_id, UserGlobalRole.expires_at)
+        .join(UserGlobalRole, UserGlobalRole.global_role_id == global_role_permissions.c.global_role_id)
+        .where(UserGlobalRole.user_id == user_id)
+    )
+    grants = global_grants
+    if tenant_id is not None:
+        tenant_grants = (
+            select(role_permissions.c.permission_id, cast(null(), DateTime(timezone=True)).label("expires_at"))
+            .join(TenantMember, TenantMember.role_id == role_permissions.c.role_id)
+            .where(
+                TenantMember.user_id == user_id,
+                TenantMember.tenant_id == tenant_id,
+                TenantMember.status == "active"
+            )
+        )
+        grants = union_all(tenant_grants, global_grants)
+
+    result = await db.execute(grants)
+    now = datetime.now(timezone.utc)
+    mask = 0
+    valid_until: Optional[datetime] = None
+    for permission_id, expires_at in result:
+        if expires_at is not None:
+            expires_at = _as_utc(expires_at)
+            if expires_at <= now:
+                continue
+            valid_until = expires_at if valid_until is None else min(valid_until, expires_at)
+        mask |= registry.bits_by_id.get(permission_id, 0)
+    return EffectivePermissions(mask=mask, valid_until=valid_until)
+
+async def get_effective_permissions(db: AsyncSession, user_id: UUID, tenant_id: Optional[UUID]) -> EffectivePermissions:
+    key = (user_id, tenant_id)
+    permissions = permission_cache.get(key)
+    if permissions is None or not permissions.is_valid(datetime.now(timezone.utc)):
+        permissions = await load_effective_permissions(db, user_id, tenant_id)
+        permission_cache.set(key, permissions)
+    return permissions
+
+def require_permission(name: str):
+    # Usage: Depends(require_permission("data.view")) -> the authenticated user
+    async def dependency(
+        request: Request,
+        current_user: AuthenticatedUser = Depends(get_current_user),
+        db: AsyncSession = Depends(get_read_db)
+    ) -> AuthenticatedUser:
+        tenant_id = request_tenant_id(request)
+        permissions = await get_effective_permissions(db, current_user.id, tenant_id)
+        bit = (await get_permission_registry(db)).bits.get(name, 0)
+        if not permissions.mask & bit:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=f"Missing permission: {name}")
+        return current_user
+    return dependency
+
+# ----------------------------------------------------------------------
+# AUTOMATIC INVALIDATION
+# Applied after commit, like the principal cache. Core DML against the RBAC
+# tables (e.g. inserts into role_permissions) conservatively clears everything.
+# ----------------------------------------------------------------------
+
+_PENDING_KEY = "permission_cache_invalidations"
+_RBAC_TABLES = {
+    table.name for table in (
+        Permission.__table__, Role.__table__, TenantMember.__table__, GlobalRole.__table__,
+        UserGlobalRole.__table__, role_permissions, global_role_permissions
+    )
+}
+
+def _pending(session: Session) -> set:
+    return session.info.setdefault(_PENDING_KEY, set())
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_core_rbac_writes(orm_execute_state: ORMExecuteState) -> None:
+    statement = orm_execute_state.statement
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(statement, "table", None)
+        if table is not None and table.name in _RBAC_TABLES:
+            _pending(orm_execute_state.session).add("registry" if table.name == "permissions" else "all")
+
+@event.listens_for(Session, "after_flush")
+def _collect_permission_invalidations(session: Session, flush_context) -> None:
+    pending = _pending(session)
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Permission):
+            pending.add("registry")
+        elif isinstance(obj, GlobalRole):
+            pending.add("all")
+        elif isinstance(obj, Role):
+            pending.add(("tenant", obj.tenant_id))
+        elif isinstance(obj, (TenantMember, UserGlobalRole)):
+            pending.add(("user", obj.user_id))
+
+@event.listens_for(Session, "after_commit")
+def _apply_permission_invalidations(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, set())
+    if "registry" in pending:
+        reset_permission_registry()
+    elif "all" in pending:
+        invalidate_permissions()
+    else:
+        for kind, value in pending:
+            if kind == "user":
+                invalidate_permissions(user_id=value)
+            else:
+                invalidate_permissions(tenant_id=value)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_permission_invalidations(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
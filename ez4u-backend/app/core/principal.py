@@ -0,0 +1,142 @@
+import os
+from typing import Any, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, ValidationError
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.database.models import User, UserIdentity
+
+# Configuration
+# The TTLs bound staleness across workers, since invalidation is per-process
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+TOKEN_STATE_CACHE_TTL_SECONDS = float(os.getenv("TOKEN_STATE_CACHE_TTL_SECONDS", "60"))
+
+class AuthenticatedUser(BaseModel):
+    # Immutable snapshot of the user behind a token; safe to share between requests
+    id: UUID
+    email: str
+    full_name: Optional[str] = None
+    is_active: bool
+    token_version: int = 0
+
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+class TokenState(BaseModel):
+    # What a signed token can't know: whether its claims went stale or the user was deactivated
+    token_version: int
+    is_active: bool
+
+    model_config = ConfigDict(frozen=True)
+
+# Keyed by token subject (UserIdentity.subject for the "local" provider)
+principal_cache: TTLCache[AuthenticatedUser] = TTLCache(PRINCIPAL_CACHE_SIZE, PRINCIPAL_CACHE_TTL_SECONDS)
+# Keyed by user id; lets claims-bearing tokens skip the DB entirely
+token_state_cache: TTLCache[TokenState] = TTLCache(PRINCIPAL_CACHE_SIZE, TOKEN_STATE_CACHE_TTL_SECONDS)
+
+def invalidate_principal(subject: str) -> None:
+    principal_cache.invalidate(subject)
+
+def invalidate_user(user_id: UUID) -> None:
+    # Needed after bulk UPDATE/DELETE statements, which bypass the ORM hooks below
+    principal_cache.invalidate_where(lambda _, principal: principal.id == user_id)
+    token_state_cache.invalidate(user_id)
+
+# ----------------------------------------------------------------------
+# DATABASE RESOLUTION
+# ----------------------------------------------------------------------
+
+async def load_principal(db: AsyncSession, subject: str) -> Optional[AuthenticatedUser]:
+    # identity -> user in a single round-trip. Tenant access isn't part of the
+    # principal: get_tenant_context checks tenant_members per tenant
+    stmt = (
+        select(User)
+        .join(UserIdentity, UserIdentity.user_id == User.id)
+        .where(UserIdentity.subject == subject, UserIdentity.provider == "local")
+        .execution_options(populate_existing=True)
+    )
+    result = await db.execute(stmt)
+    user = result.scalar_one_or_none()
+    if user is None:
+        return None
+    return AuthenticatedUser(
+        id=user.id,
+        email=user.email,
+        full_name=user.full_name,
+        is_active=user.is_active,
+        token_version=user.token_version,
+    )
+
+async def load_token_state(db: AsyncSession, user_id: UUID) -> Optional[TokenState]:
+    result = await db.execute(select(User.token_version, User.is_active).where(User.id == user_id))
+    row = result.one_or_none()
+    if row is None:
+        return None
+    state = TokenState(token_version=row.token_version, is_active=row.is_active)
+    token_state_cache.set(user_id, state)
+    return state
+
+# ----------------------------------------------------------------------
+# JWT CLAIMS
+# ----------------------------------------------------------------------
+
+def principal_claims(principal: AuthenticatedUser) -> dict[str, Any]:
+    # Identity only: tenant memberships stay out of the token, since each one
+    # added ~120 bytes and browsers silently drop cookies past ~4 KB
+    return {
+        "uid": str(principal.id),
+        "email": principal.email,
+        "name": principal.full_name,
+        "ver": principal.token_version,
+    }
+
+def principal_from_claims(payload: dict[str, Any]) -> Optional[AuthenticatedUser]:
+    # None means the token predates rich claims -> resolve via DB. Tokens issued
+    # with a tenants claim still verify; the claim is ignored
+    if "uid" not in payload or "ver" not in payload:
+        return None
+    try:
+        return AuthenticatedUser(
+            id=payload["uid"],
+            email=payload["email"],
+            full_name=payload.get("name"),
+            is_active=True,  # Checked against TokenState by the caller
+            token_version=payload["ver"],
+        )
+    except (KeyError, TypeError, ValidationError):
+        return None
+
+# ----------------------------------------------------------------------
+# AUTOMATIC INVALIDATION
+# Changes made through the ORM drop affected entries once the transaction
+# commits, so a concurrent request can't re-cache pre-commit data.
+# ----------------------------------------------------------------------
+
+_PENDING_KEY = "principal_cache_invalidations"
+
+@event.listens_for(Session, "after_flush")
+def _collect_principal_invalidations(session: Session, flush_context) -> None:
+    user_ids, subjects = session.info.setdefault(_PENDING_KEY, (set(), set()))
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User):
+            user_ids.add(obj.id)
+        elif isinstance(obj, UserIdentity):
+            user_ids.add(obj.user_id)
+            history = inspect(obj).attrs.subject.history
+            subjects.update(s for s in (obj.subject, *history.deleted) if s)
+
+@event.listens_for(Session, "after_commit")
+def _apply_principal_invalidations(session: Session) -> None:
+    user_ids, subjects = session.info.pop(_PENDING_KEY, (set(), set()))
+    for subject in subjects:
+        invalidate_principal(subject)
+    for user_id in user_ids:
+        invalidate_user(user_id)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_principal_invalidations(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
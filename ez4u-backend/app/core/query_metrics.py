@@ -0,0 +1,95 @@
+import logging
+import os
+from typing import Callable
+
+from prometheus_client import Counter, Histogram
+from prometheus_fastapi_instrumentator.metrics import Info
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.database.base import QueryStats, current_query_stats, TEST_MODE
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+# X-DB-* response headers with each request's query stats; on by default in TEST_MODE only
+DB_QUERY_HEADERS = os.getenv("DB_QUERY_HEADERS", str(TEST_MODE)).lower() == "true"
+# The same statement this many times in one request is reported as a likely N+1
+DB_N_PLUS_ONE_THRESHOLD = int(os.getenv("DB_N_PLUS_ONE_THRESHOLD", "5"))
+
+QUERY_STATS_STATE_KEY = "query_stats"
+QUERY_STATS_HEADERS = ["X-DB-Query-Count", "X-DB-Time-Ms", "X-DB-Slowest-Ms"]
+
+# Metrics (labelled like the instrumentator's HTTP metrics)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "ez4u_db_queries_per_request",
+    "SQL statements executed while handling a request",
+    ["method", "handler"],
+    buckets=(0, 1, 2, 3, 4, 6, 8, 12, 20, 50, 100),
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "ez4u_db_time_per_request_seconds",
+    "Total time spent in SQL statements while handling a request",
+    ["method", "handler"],
+)
+DB_SLOWEST_QUERY = Histogram(
+    "ez4u_db_slowest_query_seconds",
+    "Duration of the slowest SQL statement of each request",
+    ["method", "handler"],
+)
+DB_N_PLUS_ONE = Counter(
+    "ez4u_db_n_plus_one_requests_total",
+    "Requests that repeated one statement at least DB_N_PLUS_ONE_THRESHOLD times",
+    ["method", "handler"],
+)
+
+class QueryStatsMiddleware:
+    """Collects the SQL statements of each HTTP request into a QueryStats."""
+
+    def __init__(self, app: ASGIApp, headers: bool = DB_QUERY_HEADERS, n_plus_one_threshold: int = DB_N_PLUS_ONE_THRESHOLD):
+        self.app = app
+        self.headers = headers
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(label=f"{scope['method']} {scope['path']}")
+        scope.setdefault("state", {})[QUERY_STATS_STATE_KEY] = stats
+
+        async def send_with_headers(message: Message) -> None:
+            # Streamed bodies keep querying after this; the headers cover up to the first byte
+            if message["type"] == "http.response.start" and self.headers:
+                values = [str(stats.count), f"{stats.total_time * 1000:.2f}", f"{stats.slowest[0] * 1000:.2f}"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (name.lower().encode(), value.encode()) for name, value in zip(QUERY_STATS_HEADERS, values)
+                ]
+            await send(message)
+
+        token = current_query_stats.set(stats)
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            current_query_stats.reset(token)
+            for statement, times in stats.repeated(self.n_plus_one_threshold)[:1]:
+                route = scope.get("route")
+                logger.warning(
+                    "Possible N+1 in %s %s: statement ran %d times: %s", scope["method"],
+                    getattr(route, "path", scope["path"]), times, " ".join(statement.split())[:300]
+                )
+
+def db_query_metrics(n_plus_one_threshold: int = DB_N_PLUS_ONE_THRESHOLD) -> Callable[[Info], None]:
+    # Instrumentator metric: records the QueryStats left on request.state by the middleware
+    def instrumentation(info: Info) -> None:
+        stats = getattr(info.request.state, QUERY_STATS_STATE_KEY, None)
+        if stats is None:
+            return
+        labels = (info.method, info.modified_handler)
+        DB_QUERIES_PER_REQUEST.labels(*labels).observe(stats.count)
+        DB_TIME_PER_REQUEST.labels(*labels).observe(stats.total_time)
+        DB_SLOWEST_QUERY.labels(*labels).observe(stats.slowest[0])
+        if stats.repeated(n_plus_one_threshold):
+            DB_N_PLUS_ONE.labels(*labels).inc()
+
+    return instrumentation
@@ -0,0 +1,156 @@
+import logging
+import math
+import os
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from prometheus_client import Counter
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+LOGIN_RATE_LIMIT_ENABLED = os.getenv("LOGIN_RATE_LIMIT_ENABLED", "True").lower() == "true"
+# Bucket size (burst) and refill rate per client IP and per submitted username.
+# Keep the username bucket generous: anyone can drain it for a victim's account.
+LOGIN_RATE_LIMIT_IP_BURST = int(os.getenv("LOGIN_RATE_LIMIT_IP_BURST", "20"))
+LOGIN_RATE_LIMIT_IP_PER_MINUTE = float(os.getenv("LOGIN_RATE_LIMIT_IP_PER_MINUTE", "30"))
+LOGIN_RATE_LIMIT_USERNAME_BURST = int(os.getenv("LOGIN_RATE_LIMIT_USERNAME_BURST", "10"))
+LOGIN_RATE_LIMIT_USERNAME_PER_MINUTE = float(os.getenv("LOGIN_RATE_LIMIT_USERNAME_PER_MINUTE", "5"))
+# Unset: buckets live in process memory, so each worker limits on its own
+LOGIN_RATE_LIMIT_REDIS_URL = os.getenv("LOGIN_RATE_LIMIT_REDIS_URL")
+LOGIN_RATE_LIMIT_MAX_KEYS = int(os.getenv("LOGIN_RATE_LIMIT_MAX_KEYS", "100000"))
+
+# Metrics
+LOGIN_RATE_LIMITED = Counter(
+    "ez4u_login_rate_limited_total",
+    "Login attempts rejected by the rate limiter before any DB or hashing work",
+    ["scope"],
+)
+LOGIN_RATE_LIMIT_ERRORS = Counter(
+    "ez4u_login_rate_limit_backend_errors_total",
+    "Rate limiter backend failures (the attempt is allowed through)",
+)
+
+class RateLimitBackend:
+    """Token bucket storage. ``take`` spends one token from ``key`` and returns
+    0 when allowed, otherwise the seconds until a token is available."""
+
+    async def take(self, key: str, capacity: int, refill_per_second: float) -> float:
+        raise NotImplementedError
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """Per-process buckets, evicting the least recently used key beyond ``max_keys``."""
+
+    def __init__(self, max_keys: int = LOGIN_RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        # Only touched from the event loop thread, so no lock is needed
+        self._buckets: "OrderedDict[str, tuple[float, float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    async def take(self, key: str, capacity: int, refill_per_second: float) -> float:
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * refill_per_second)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / refill_per_second
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        # An evicted bucket restarts full, so drop the idlest (most refilled) ones
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+# Refill, spend and store atomically on the Redis server, using its clock so
+# workers with skewed clocks agree. Returned as a string: Lua numbers would be
+# truncated to integers.
+_TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(now - updated, 0) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """Buckets shared by every worker through Redis (one round-trip per bucket)."""
+
+    def __init__(self, url: str, prefix: str = "ez4u:ratelimit:"):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("LOGIN_RATE_LIMIT_REDIS_URL requires the redis package")
+        self.prefix = prefix
+        self._client = redis.from_url(url)
+        self._script = self._client.register_script(_TOKEN_BUCKET_SCRIPT)
+
+    async def take(self, key: str, capacity: int, refill_per_second: float) -> float:
+        return float(await self._script(keys=[self.prefix + key], args=[capacity, refill_per_second]))
+
+class LoginRateLimiter:
+    """Checks the per-IP bucket, then the per-username one, before a login
+    attempt touches the database or the hashing pool."""
+
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        enabled: bool = LOGIN_RATE_LIMIT_ENABLED,
+        ip_burst: int = LOGIN_RATE_LIMIT_IP_BURST,
+        ip_per_minute: float = LOGIN_RATE_LIMIT_IP_PER_MINUTE,
+        username_burst: int = LOGIN_RATE_LIMIT_USERNAME_BURST,
+        username_per_minute: float = LOGIN_RATE_LIMIT_USERNAME_PER_MINUTE,
+    ):
+        self.backend = backend
+        self.enabled = enabled
+        self.limits = {
+            "ip": (ip_burst, ip_per_minute / 60),
+            "username": (username_burst, username_per_minute / 60),
+        }
+
+    async def check(self, ip: Optional[str], username: str) -> int:
+        # Returns 0 when the attempt may proceed, else the Retry-After seconds
+        if not self.enabled:
+            return 0
+        # Usernames are matched case-sensitively at login, but normalising here
+        # stops trivial case variations from getting fresh buckets
+        keys = (("ip", ip or "unknown"), ("username", username.strip().lower()))
+        for scope, value in keys:
+            capacity, refill_per_second = self.limits[scope]
+            if capacity <= 0:
+                continue
+            try:
+                wait = await self.backend.take(f"login:{scope}:{value}", capacity, refill_per_second)
+            except Exception:
+                # A broken shared store must not take login down with it
+                LOGIN_RATE_LIMIT_ERRORS.inc()
+                logger.warning("Login rate limiter backend failed; allowing attempt", exc_info=True)
+                return 0
+            if wait > 0:
+                # A rejected IP doesn't spend the username's tokens
+                LOGIN_RATE_LIMITED.labels(scope).inc()
+                return max(1, math.ceil(wait))
+        return 0
+
+def _default_backend() -> RateLimitBackend:
+    if LOGIN_RATE_LIMIT_REDIS_URL:
+        return RedisRateLimitBackend(LOGIN_RATE_LIMIT_REDIS_URL)
+    return MemoryRateLimitBackend()
+
+login_rate_limiter = LoginRateLimiter(_default_backend())
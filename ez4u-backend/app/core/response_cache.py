@@ -0,0 +1,311 @@
+import asyncio
+import logging
+import math
+import os
+from collections import Counter as TagCounter
+from typing import Callable, FrozenSet, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlencode
+
+from fastapi import Request, Response, status
+from fastapi.routing import APIRoute
+from prometheus_client import Counter
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from app.core.cache import TTLCache
+from app.core.http_cache import etag_matches
+from app.core.tenancy import TENANT_HEADER
+from app.database.models import Tenant, tenant_closure
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+# The TTL bounds staleness across workers with the in-memory backend, since
+# invalidation is per-process there. RESPONSE_CACHE_SIZE=0 disables caching.
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "1000"))
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "30"))
+# Any server speaking the Redis protocol (Redis, Valkey, a local stand-in)
+RESPONSE_CACHE_REDIS_URL = os.getenv("RESPONSE_CACHE_REDIS_URL")
+
+# Metrics
+RESPONSE_CACHE_REQUESTS = Counter(
+    "ez4u_response_cache_requests_total",
+    "Requests to cached routes, by route template and hit/miss",
+    ["handler", "result"],
+)
+RESPONSE_CACHE_INVALIDATIONS = Counter(
+    "ez4u_response_cache_invalidations_total",
+    "Tag invalidations applied after a commit",
+    ["tag"],
+)
+RESPONSE_CACHE_ERRORS = Counter(
+    "ez4u_response_cache_backend_errors_total",
+    "Response cache backend failures (requests fall through to the handler; entries expire by TTL)",
+    ["operation"],
+)
+
+# Headers a cached copy must not replay
+_UNCACHED_HEADERS = {"set-cookie", "date"}
+
+class CachedResponse(BaseModel):
+    status_code: int
+    headers: List[Tuple[str, str]]
+    body: bytes
+    tags: FrozenSet[str]
+
+    model_config = ConfigDict(frozen=True, ser_json_bytes="base64", val_json_bytes="base64")
+
+class ResponseCacheBackend:
+    """Storage for cached responses. Every tag has a generation that
+    ``invalidate`` bumps; ``set`` only stores an entry if its tags' generations
+    still match the snapshot taken before the handler ran, so a write that
+    commits mid-request can't be overwritten by the response it raced with.
+    ``invalidate`` is called from commit hooks, which are synchronous."""
+
+    async def generations(self, tags: FrozenSet[str]) -> Tuple[int, ...]:
+        raise NotImplementedError
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        raise NotImplementedError
+
+    async def set(self, key: str, entry: CachedResponse, generations: Tuple[int, ...]) -> None:
+        raise NotImplementedError
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        raise NotImplementedError
+
+class MemoryResponseCacheBackend(ResponseCacheBackend):
+    """Per-process LRU with TTL; invalidation scans the entries' tags."""
+
+    def __init__(self, maxsize: int = RESPONSE_CACHE_SIZE, ttl: float = RESPONSE_CACHE_TTL_SECONDS):
+        self.entries: TTLCache[CachedResponse] = TTLCache(maxsize, ttl)
+        self.tag_generations: TagCounter = TagCounter()
+
+    async def generations(self, tags: FrozenSet[str]) -> Tuple[int, ...]:
+        return tuple(self.tag_generations[tag] for tag in sorted(tags))
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        return self.entries.get(key)
+
+    async def set(self, key: str, entry: CachedResponse, generations: Tuple[int, ...]) -> None:
+        # No await between the check and the store, so no commit can slip in
+        if await self.generations(entry.tags) == generations:
+            self.entries.set(key, entry)
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        tags = frozenset(tags)
+        self.tag_generations.update(tags)
+        # Linear scan, like the permission cache: writes to tagged tables are rare
+        self.entries.invalidate_where(lambda _, entry: entry.tags & tags)
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+class RedisResponseCacheBackend(ResponseCacheBackend):
+    """Shared by every worker. Each tag is a set of the keys cached under it
+    plus a generation counter; invalidating bumps the counter and deletes the
+    keys, so other workers see it immediately."""
+
+    def __init__(self, url: str, ttl: float = RESPONSE_CACHE_TTL_SECONDS, prefix: str = "ez4u:response:"):
+        try:
+            import redis
+            import redis.asyncio
+        except ImportError:
+            raise RuntimeError("RESPONSE_CACHE_REDIS_URL requires the redis package")
+        self.ttl = max(1, math.ceil(ttl))
+        self.prefix = prefix
+        self._client = redis.asyncio.from_url(url)
+        self._watch_error = redis.WatchError
+        # Commit hooks run on the event loop, so invalidation is handed to a task
+        # instead of blocking it; get/generations wait for this process's own
+        # pending invalidations, so a worker always reads its own writes
+        self._invalidations: Set[asyncio.Task] = set()
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+    def _generation_key(self, tag: str) -> str:
+        return f"{self.prefix}generation:{tag}"
+
+    async def _settle(self) -> None:
+        if self._invalidations:
+            await asyncio.wait(list(self._invalidations))
+
+    async def generations(self, tags: FrozenSet[str]) -> Tuple[int, ...]:
+        await self._settle()
+        values = await self._client.mget([self._generation_key(tag) for tag in sorted(tags)])
+        return tuple(int(value or 0) for value in values)
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        await self._settle()
+        raw = await self._client.get(self.prefix + key)
+        return CachedResponse.model_validate_json(raw) if raw is not None else None
+
+    async def set(self, key: str, entry: CachedResponse, generations: Tuple[int, ...]) -> None:
+        generation_keys = [self._generation_key(tag) for tag in sorted(entry.tags)]
+        async with self._client.pipeline(transaction=True) as pipe:
+            try:
+                # WATCH makes the store fail if an invalidation lands in between
+                await pipe.watch(*generation_keys)
+                current = tuple(int(value or 0) for value in await pipe.mget(generation_keys))
+                if current != generations:
+                    return
+                pipe.multi()
+                pipe.set(self.prefix + key, entry.model_dump_json(), ex=self.ttl)
+                for tag in entry.tags:
+                    pipe.sadd(self._tag_key(tag), self.prefix + key)
+                    pipe.expire(self._tag_key(tag), self.ttl)
+                await pipe.execute()
+            except self._watch_error:
+                pass
+
+    async def _invalidate(self, tags: FrozenSet[str]) -> None:
+        try:
+            tag_keys = [self._tag_key(tag) for tag in tags]
+            async with self._client.pipeline(transaction=False) as pipe:
+                for tag in tags:
+                    pipe.incr(self._generation_key(tag))
+                for tag_key in tag_keys:
+                    pipe.smembers(tag_key)
+                members = (await pipe.execute())[len(tags):]
+            await self._client.delete(*tag_keys, *{key for keys in members for key in keys})
+        except Exception:
+            # The write is already committed; stale entries expire with the TTL
+            RESPONSE_CACHE_ERRORS.labels("invalidate").inc()
+            logger.warning("Response cache invalidation failed for %s", sorted(tags), exc_info=True)
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        task = asyncio.get_running_loop().create_task(self._invalidate(frozenset(tags)))
+        self._invalidations.add(task)
+        task.add_done_callback(self._invalidations.discard)
+
+def _default_backend() -> ResponseCacheBackend:
+    if RESPONSE_CACHE_REDIS_URL:
+        return RedisResponseCacheBackend(RESPONSE_CACHE_REDIS_URL)
+    return MemoryResponseCacheBackend()
+
+response_cache: ResponseCacheBackend = _default_backend()
+
+# ----------------------------------------------------------------------
+# ROUTES
+# ----------------------------------------------------------------------
+
+def cache_response(*tags: str) -> Callable:
+    # Marks a GET endpoint for CachedRoute, invalidated when any of the tags'
+    # tables are written. Only for responses that don't depend on the caller:
+    # a hit skips the endpoint's dependencies, authentication included.
+    def decorator(endpoint: Callable) -> Callable:
+        endpoint.response_cache_tags = frozenset(tags)
+        return endpoint
+    return decorator
+
+def response_cache_key(route_path: str, request: Request) -> str:
+    # Route template, concrete path (its parameters), sorted query and tenant header
+    query = urlencode(sorted(request.query_params.multi_items()))
+    return f"{route_path}|{request.url.path}|{query}|{request.headers.get(TENANT_HEADER, '')}"
+
+class CachedRoute(APIRoute):
+    """APIRoute that serves endpoints marked with @cache_response from the response cache."""
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        tags = getattr(self.endpoint, "response_cache_tags", None)
+        if tags is None:
+            return handler
+        route_path = self.path
+
+        async def cached_handler(request: Request) -> Response:
+            if request.method != "GET":
+                return await handler(request)
+            key = response_cache_key(route_path, request)
+            try:
+                entry = await response_cache.get(key)
+                # Snapshot before the handler reads; a commit after this point skips the store
+                generations = await response_cache.generations(tags) if entry is None else None
+            except Exception:
+                # A broken shared store must not take the route down with it
+                RESPONSE_CACHE_ERRORS.labels("get").inc()
+                logger.warning("Response cache lookup failed; serving uncached", exc_info=True)
+                return await handler(request)
+            if entry is not None:
+                RESPONSE_CACHE_REQUESTS.labels(route_path, "hit").inc()
+                headers = dict(entry.headers)
+                # Revalidation against a cached copy costs no database work at all
+                if "etag" in headers and etag_matches(request, headers["etag"]):
+                    validators = {name: headers[name] for name in ("etag", "cache-control", "last-modified") if name in headers}
+                    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validators)
+                response = Response(content=entry.body, status_code=entry.status_code)
+                response.raw_headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in entry.headers]
+                return response
+
+            RESPONSE_CACHE_REQUESTS.labels(route_path, "miss").inc()
+            response = await handler(request)
+            # Streamed bodies, errors, 304s and cookie-setting responses aren't stored
+            raw_headers = [(name.decode("latin-1"), value.decode("latin-1")) for name, value in response.raw_headers]
+            if (
+                response.status_code == status.HTTP_200_OK and hasattr(response, "body")
+                and not any(name == "set-cookie" for name, _ in raw_headers)
+            ):
+                entry = CachedResponse(
+                    status_code=response.status_code,
+                    headers=[(name, value) for name, value in raw_headers if name not in _UNCACHED_HEADERS],
+                    body=response.body,
+                    tags=tags,
+                )
+                try:
+                    await response_cache.set(key, entry, generations)
+                except Exception:
+                    RESPONSE_CACHE_ERRORS.labels("set").inc()
+                    logger.warning("Response cache store failed", exc_info=True)
+            return response
+
+        return cached_handler
+
+# ----------------------------------------------------------------------
+# AUTOMATIC INVALIDATION
+# Tags are collected per session and applied after commit, like the
+# permission cache. Core DML against a tagged table invalidates its tag too.
+# ----------------------------------------------------------------------
+
+_PENDING_KEY = "response_cache_invalidations"
+_TAGS_BY_TABLE = {
+    Tenant.__table__.name: "tenants",
+    tenant_closure.name: "tenants",
+}
+_TAGS_BY_ENTITY = ((Tenant, "tenants"),)
+
+def _pending(session: Session) -> set:
+    return session.info.setdefault(_PENDING_KEY, set())
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_core_cache_writes(orm_execute_state: ORMExecuteState) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None and table.name in _TAGS_BY_TABLE:
+            _pending(orm_execute_state.session).add(_TAGS_BY_TABLE[table.name])
+
+@event.listens_for(Session, "after_flush")
+def _collect_cache_invalidations(session: Session, flush_context) -> None:
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        for entity, tag in _TAGS_BY_ENTITY:
+            if isinstance(obj, entity):
+                _pending(session).add(tag)
+
+@event.listens_for(Session, "after_commit")
+def _apply_cache_invalidations(session: Session) -> None:
+    tags = session.info.pop(_PENDING_KEY, set())
+    if tags:
+        try:
+            response_cache.invalidate(tags)
+        except Exception:
+            # Raising here would fail a request whose write already committed
+            RESPONSE_CACHE_ERRORS.labels("invalidate").inc()
+            logger.warning("Response cache invalidation failed for %s", sorted(tags), exc_info=True)
+            return
+        for tag in tags:
+            RESPONSE_CACHE_INVALIDATIONS.labels(tag).inc()
+
+@event.listens_for(Session, "after_rollback")
+def _discard_cache_invalidations(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -1,6 +1,7 @@
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Any
 from jose import jwt
+from opentelemetry import trace
 from passlib.context import CryptContext
 import os
 
@@ -11,18 +12,29 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
 pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 
+tracer = trace.get_tracer("ez4u.security")
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    with tracer.start_as_current_span("password.verify"):
+        return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    with tracer.start_as_current_span("password.hash"):
+        return pwd_context.hash(password)
 
-def create_access_token(subject: str | Any, expires_delta: Optional[timedelta] = None) -> str:
+def create_access_token(subject: str | Any, expires_delta: Optional[timedelta] = None, claims: Optional[dict[str, Any]] = None) -> str:
     if expires_delta:
         expire = datetime.now(timezone.utc) + expires_delta
     else:
         expire = datetime.now(timezone.utc) + timedelta(minutes=15)
     
-    to_encode = {"sub": str(subject), "exp": expire}
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    # Extra signed claims (user id, token version) let auth skip the DB
+    to_encode = {**(claims or {}), "sub": str(subject), "exp": expire}
+    with tracer.start_as_current_span("jwt.encode"):
+        encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
+
+def decode_access_token(token: str) -> dict[str, Any]:
+    # Raises jose.JWTError for invalid or expired tokens
+    with tracer.start_as_current_span("jwt.decode"):
+        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
@@ -0,0 +1,139 @@
+import os
+from typing import Optional
+from uuid import UUID
+
+from fastapi import Depends, HTTPException, Request, status
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from app.core.authentication import get_current_user
+from app.core.cache import TTLCache
+from app.core.principal import AuthenticatedUser
+from app.database.models import Tenant, TenantMember
+from app.database.session import get_db, get_read_db, set_rls_context
+
+# Configuration
+# Invalidation is per-process, so the TTL bounds how long another worker may
+# still admit a removed or suspended member
+MEMBERSHIP_CACHE_SIZE = int(os.getenv("MEMBERSHIP_CACHE_SIZE", "50000"))
+MEMBERSHIP_CACHE_TTL_SECONDS = float(os.getenv("MEMBERSHIP_CACHE_TTL_SECONDS", "30"))
+
+TENANT_HEADER = "X-Tenant-ID"
+
+class TenantContext(BaseModel):
+    tenant_id: UUID
+    user_id: UUID
+    role_id: UUID
+
+    model_config = ConfigDict(frozen=True)
+
+def request_tenant_id(request: Request) -> Optional[UUID]:
+    # Tenant-scoped routes carry it in the path; others may send a header
+    raw = request.path_params.get("tenant_id") or request.headers.get(TENANT_HEADER)
+    if raw is None:
+        return None
+    try:
+        return raw if isinstance(raw, UUID) else UUID(str(raw))
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid tenant id")
+
+# (user_id, tenant_id) -> role_id of the active membership; only hits are cached
+membership_cache: TTLCache[UUID] = TTLCache(MEMBERSHIP_CACHE_SIZE, MEMBERSHIP_CACHE_TTL_SECONDS)
+
+async def load_membership_role(db: AsyncSession, user_id: UUID, tenant_id: UUID) -> Optional[UUID]:
+    return await db.scalar(
+        select(TenantMember.role_id).where(
+            TenantMember.user_id == user_id,
+            TenantMember.tenant_id == tenant_id,
+            TenantMember.status == "active"
+        )
+    )
+
+async def get_tenant_context(
+    request: Request,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+) -> TenantContext:
+    tenant_id = request_tenant_id(request)
+    if tenant_id is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Tenant not specified")
+    # Checked against tenant_members, not the token's claims, which may predate a
+    # removal, suspension or role change; commits invalidate the cached result
+    key = (current_user.id, tenant_id)
+    role_id = membership_cache.get(key)
+    if role_id is None:
+        role_id = await load_membership_role(db, current_user.id, tenant_id)
+        if role_id is None:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this tenant")
+        membership_cache.set(key, role_id)
+    return TenantContext(tenant_id=tenant_id, user_id=current_user.id, role_id=role_id)
+
+# Request-scoped sessions with the tenant/user RLS context applied
+async def get_tenant_db(
+    context: TenantContext = Depends(get_tenant_context),
+    db: AsyncSession = Depends(get_db)
+) -> AsyncSession:
+    await set_rls_context(db, context.tenant_id, context.user_id)
+    return db
+
+async def get_tenant_read_db(
+    context: TenantContext = Depends(get_tenant_context),
+    db: AsyncSession = Depends(get_read_db)
+) -> AsyncSession:
+    await set_rls_context(db, context.tenant_id, context.user_id)
+    return db
+
+# ----------------------------------------------------------------------
+# AUTOMATIC INVALIDATION
+# Applied after commit, like the principal and permission caches. Deleting a
+# tenant cascades to its memberships in the DB, so it drops the whole tenant;
+# Core DML against tenant_members clears everything.
+# ----------------------------------------------------------------------
+
+_PENDING_KEY = "membership_cache_invalidations"
+
+def invalidate_memberships(user_id: Optional[UUID] = None, tenant_id: Optional[UUID] = None) -> None:
+    if user_id is None and tenant_id is None:
+        membership_cache.clear()
+        return
+    membership_cache.invalidate_where(
+        lambda key, _: (user_id is None or key[0] == user_id) and (tenant_id is None or key[1] == tenant_id)
+    )
+
+def _pending(session: Session) -> set:
+    return session.info.setdefault(_PENDING_KEY, set())
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_core_membership_writes(orm_execute_state: ORMExecuteState) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None and table.name == TenantMember.__tablename__:
+            _pending(orm_execute_state.session).add("all")
+
+@event.listens_for(Session, "after_flush")
+def _collect_membership_invalidations(session: Session, flush_context) -> None:
+    pending = _pending(session)
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, TenantMember):
+            # A row moved to another user or tenant leaves the old key stale too
+            attrs = inspect(obj).attrs
+            for user_id in (obj.user_id, *attrs.user_id.history.deleted):
+                for tenant_id in (obj.tenant_id, *attrs.tenant_id.history.deleted):
+                    pending.add((user_id, tenant_id))
+        elif isinstance(obj, Tenant) and obj in session.deleted:
+            pending.add((None, obj.id))
+
+@event.listens_for(Session, "after_commit")
+def _apply_membership_invalidations(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, set())
+    if "all" in pending:
+        invalidate_memberships()
+        return
+    for user_id, tenant_id in pending:
+        invalidate_memberships(user_id=user_id, tenant_id=tenant_id)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_membership_invalidations(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,79 @@
+import os
+
+from opentelemetry import propagate, trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter, SpanExporter
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from opentelemetry.trace import SpanKind, StatusCode
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Configuration (standard OpenTelemetry variable names)
+# "none" leaves the no-op tracer in place: spans cost a function call each
+OTEL_TRACES_EXPORTER = os.getenv("OTEL_TRACES_EXPORTER", "none").lower()
+# Fraction of new traces recorded; upstream sampling decisions are honoured
+OTEL_TRACES_SAMPLER_ARG = float(os.getenv("OTEL_TRACES_SAMPLER_ARG", "0.05"))
+OTEL_SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "ez4u-backend")
+
+tracer = trace.get_tracer("ez4u")
+
+def _span_exporter(name: str) -> SpanExporter:
+    if name == "console":
+        return ConsoleSpanExporter()
+    if name == "otlp":
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        except ImportError:
+            raise RuntimeError("OTEL_TRACES_EXPORTER=otlp requires the opentelemetry-exporter-otlp-proto-http package")
+        # Endpoint and headers come from OTEL_EXPORTER_OTLP_* variables
+        return OTLPSpanExporter()
+    raise ValueError(f"Unknown OTEL_TRACES_EXPORTER: {name!r}")
+
+def configure_tracing(exporter: str = OTEL_TRACES_EXPORTER, sample_ratio: float = OTEL_TRACES_SAMPLER_ARG) -> bool:
+    if exporter == "none":
+        return False
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": OTEL_SERVICE_NAME}),
+        sampler=ParentBased(TraceIdRatioBased(sample_ratio)),
+    )
+    # Batching keeps export off the request path
+    provider.add_span_processor(BatchSpanProcessor(_span_exporter(exporter)))
+    trace.set_tracer_provider(provider)
+    return True
+
+class TracingMiddleware:
+    """Opens a server span per HTTP request, continuing incoming W3C trace context."""
+
+    def __init__(self, app: ASGIApp, excluded_paths: tuple = ("/metrics",)):
+        self.app = app
+        self.excluded_paths = excluded_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.excluded_paths):
+            await self.app(scope, receive, send)
+            return
+
+        carrier = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope["headers"]}
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        with tracer.start_as_current_span(
+            scope["method"], context=propagate.extract(carrier), kind=SpanKind.SERVER,
+            attributes={"http.request.method": scope["method"], "url.path": scope["path"]},
+        ) as span:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                # The route template is only known once the router has matched
+                route = getattr(scope.get("route"), "path", None)
+                if route is not None:
+                    span.update_name(f"{scope['method']} {route}")
+                    span.set_attribute("http.route", route)
+                span.set_attribute("http.response.status_code", status_code)
+                if status_code >= 500:
+                    span.set_status(StatusCode.ERROR)
@@ -0,0 +1,290 @@
+import asyncio
+import contextvars
+import csv
+import io
+import json
+import logging
+import os
+import uuid
+from datetime import datetime, timezone
+from typing import IO, Dict, Iterator, List, Optional, Tuple
+
+from prometheus_client import Counter
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, ValidationError, computed_field
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.cache import TTLCache
+from app.core.password_hashes import PasswordHashPrecomputer
+from app.database.base import engine
+from app.database.bulk import RowBatch, write_batch
+from app.database.models import User, UserIdentity, UserAddress, UserPhoneNumber, UserEmail, Role, TenantMember
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))  # Users per validation pass and insert transaction
+IMPORT_MAX_BYTES = int(os.getenv("IMPORT_MAX_BYTES", str(200 * 1024 * 1024)))
+IMPORT_SPOOL_MEMORY_BYTES = int(os.getenv("IMPORT_SPOOL_MEMORY_BYTES", str(8 * 1024 * 1024)))  # Larger uploads spill to disk
+IMPORT_CONCURRENCY = int(os.getenv("IMPORT_CONCURRENCY", "1"))  # Jobs running at once per worker
+# argon2 in separate processes; kept below the core count so imports can't starve logins
+IMPORT_HASH_WORKERS = int(os.getenv("IMPORT_HASH_WORKERS", str(max(1, (os.cpu_count() or 1) // 2))))
+IMPORT_DEFAULT_ROLE = os.getenv("IMPORT_DEFAULT_ROLE", "customer")
+IMPORT_MAX_ERRORS = 100  # Row errors kept per job; rows_failed keeps counting
+IMPORT_JOB_HISTORY = 1000
+IMPORT_JOB_TTL_SECONDS = 24 * 60 * 60
+
+IMPORT_FORMATS = {"text/csv": "csv", "application/x-ndjson": "ndjson", "application/jsonl": "ndjson"}
+
+# Metrics
+IMPORT_ROWS = Counter(
+    "ez4u_user_import_rows_total",
+    "Rows processed by user import jobs",
+    ["result"],
+)
+
+# ----------------------------------------------------------------------
+# ROW FORMAT
+# ----------------------------------------------------------------------
+
+class ImportAddress(BaseModel):
+    street: str = Field(max_length=255)
+    city: str = Field(max_length=100)
+    state: Optional[str] = Field(None, max_length=100)
+    postal_code: str = Field(max_length=20)
+    country: str = Field(max_length=100)
+    is_primary: bool = False
+    label: Optional[str] = Field(None, max_length=50)
+
+    model_config = ConfigDict(extra="forbid", str_strip_whitespace=True)
+
+class ImportPhoneNumber(BaseModel):
+    phone_number: str = Field(max_length=50)
+    is_primary: bool = False
+    label: Optional[str] = Field(None, max_length=50)
+
+    model_config = ConfigDict(extra="forbid", str_strip_whitespace=True)
+
+class ImportEmail(BaseModel):
+    email: EmailStr
+    is_primary: bool = False
+    label: Optional[str] = Field(None, max_length=50)
+
+    model_config = ConfigDict(extra="forbid", str_strip_whitespace=True)
+
+class ImportUserRow(BaseModel):
+    """One user to import. NDJSON lines carry the lists directly; CSV rows use
+    flat columns for a single primary address and phone number."""
+
+    email: EmailStr
+    full_name: Optional[str] = Field(None, max_length=255)
+    username: Optional[str] = Field(None, min_length=1, max_length=500)  # Local login; defaults to email
+    password: Optional[str] = Field(None, min_length=1)  # None: no local login until one is set
+    role: str = IMPORT_DEFAULT_ROLE
+    is_active: bool = True
+    addresses: List[ImportAddress] = []
+    phone_numbers: List[ImportPhoneNumber] = []
+    emails: List[ImportEmail] = []  # Besides the primary email
+
+    model_config = ConfigDict(extra="forbid", str_strip_whitespace=True)
+
+    @property
+    def subject(self) -> str:
+        return self.username or self.email
+
+CSV_ADDRESS_COLUMNS = ("street", "city", "state", "postal_code", "country")
+
+def csv_record(record: Dict[str, Optional[str]]) -> dict:
+    # Flat CSV columns -> the NDJSON shape; blank cells mean "not given"
+    row = {key: value for key, value in record.items() if key is not None and value not in (None, "")}
+    address = {column: row.pop(column) for column in CSV_ADDRESS_COLUMNS if column in row}
+    if address:
+        row["addresses"] = [{**address, "is_primary": True}]
+    if "phone_number" in row:
+        row["phone_numbers"] = [{"phone_number": row.pop("phone_number"), "is_primary": True}]
+    if None in record:
+        row["_extra"] = record[None]  # More cells than headers; rejected by extra="forbid"
+    return row
+
+def format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" if item["loc"] else item["msg"]
+        for item in error.errors(include_url=False)
+    )
+
+def read_records(stream: IO[bytes], format: str) -> Iterator[Tuple[int, object]]:
+    # (line number, dict or error message) per record, reading the spooled upload lazily
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if format == "csv":
+        reader = csv.DictReader(text)
+        for record in reader:
+            yield reader.line_num, csv_record(record)
+        return
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield line_number, f"Invalid JSON: {exc}"
+            continue
+        yield line_number, record if isinstance(record, dict) else "Expected a JSON object"
+
+def validate_batch(records: Iterator[Tuple[int, object]], size: int) -> Tuple[int, List[Tuple[int, ImportUserRow]], List[Tuple[int, str]]]:
+    # Runs in a worker thread: file reads, parsing and validation stay off the event loop
+    rows, errors, read = [], [], 0
+    for line, record in records:
+        read += 1
+        if isinstance(record, str):
+            errors.append((line, record))
+        else:
+            try:
+                rows.append((line, ImportUserRow.model_validate(record)))
+            except ValidationError as exc:
+                errors.append((line, format_validation_error(exc)))
+        if read >= size:
+            break
+    return read, rows, errors
+
+# ----------------------------------------------------------------------
+# JOBS
+# ----------------------------------------------------------------------
+
+class ImportRowError(BaseModel):
+    line: int
+    error: str
+
+class ImportJob(BaseModel):
+    """Progress of one import; mutated by its background task, read by the progress endpoint."""
+
+    id: uuid.UUID
+    tenant_id: uuid.UUID
+    format: str
+    status: str = "queued"  # "queued", "running", "completed", "failed"
+    rows_read: int = 0
+    rows_imported: int = 0
+    rows_failed: int = 0
+    errors: List[ImportRowError] = []
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @computed_field
+    @property
+    def rows_per_second(self) -> Optional[float]:
+        if self.started_at is None:
+            return None
+        elapsed = ((self.finished_at or datetime.now(timezone.utc)) - self.started_at).total_seconds()
+        return round(self.rows_read / elapsed, 1) if elapsed > 0 else None
+
+    def fail_rows(self, errors: List[Tuple[int, str]]) -> None:
+        self.rows_failed += len(errors)
+        IMPORT_ROWS.labels("failed").inc(len(errors))
+        room = IMPORT_MAX_ERRORS - len(self.errors)
+        self.errors.extend(ImportRowError(line=line, error=error) for line, error in errors[:max(room, 0)])
+
+# Per-process: progress is visible on the worker that accepted the upload
+import_jobs: TTLCache[ImportJob] = TTLCache(IMPORT_JOB_HISTORY, IMPORT_JOB_TTL_SECONDS)
+import_hasher = PasswordHashPrecomputer(workers=IMPORT_HASH_WORKERS)
+_job_slots = asyncio.Semaphore(IMPORT_CONCURRENCY)
+_running: set = set()  # Strong references, so running jobs aren't garbage collected
+
+def build_rows(batch: RowBatch, tenant_id: uuid.UUID, role_id: uuid.UUID, row: ImportUserRow, password_hash: Optional[str]) -> None:
+    # Every column is explicit: COPY applies no Python-side defaults
+    user_id = uuid.uuid4()
+    batch.add(User.__table__, id=user_id, email=row.email, full_name=row.full_name, is_active=row.is_active, token_version=0)
+    batch.add(UserIdentity.__table__, id=uuid.uuid4(), user_id=user_id, provider="local", subject=row.subject, password_hash=password_hash)
+    batch.add(TenantMember.__table__, id=uuid.uuid4(), tenant_id=tenant_id, user_id=user_id, role_id=role_id, status="active")
+    for address in row.addresses:
+        batch.add(UserAddress.__table__, id=uuid.uuid4(), user_id=user_id, **address.model_dump())
+    for phone in row.phone_numbers:
+        batch.add(UserPhoneNumber.__table__, id=uuid.uuid4(), user_id=user_id, is_verified=False, **phone.model_dump())
+    # row.email is already validated; re-running email_validator here would double the batch's CPU time
+    primary = ImportEmail.model_construct(email=row.email, is_primary=True, label="Primary")
+    emails = [primary, *(e for e in row.emails if e.email != row.email)]
+    for email in emails:
+        batch.add(UserEmail.__table__, id=uuid.uuid4(), user_id=user_id, verified_at=None, **email.model_dump())
+
+async def import_batch(db_engine: AsyncEngine, job: ImportJob, rows: List[Tuple[int, ImportUserRow]], role_ids: Dict[str, uuid.UUID]) -> None:
+    errors: List[Tuple[int, str]] = []
+    # Duplicates within the batch, then against the database (earlier batches included)
+    accepted, emails, subjects = [], set(), set()
+    for line, row in rows:
+        if row.role not in role_ids:
+            errors.append((line, f"role: unknown role {row.role!r}"))
+        elif row.email in emails or row.subject in subjects:
+            errors.append((line, "Duplicate email or username in this import"))
+        else:
+            emails.add(row.email)
+            subjects.add(row.subject)
+            accepted.append((line, row))
+    if accepted:
+        async with db_engine.connect() as conn:
+            taken_emails = set((await conn.execute(select(User.email).where(User.email.in_(emails)))).scalars())
+            taken_subjects = set((await conn.execute(select(UserIdentity.subject).where(
+                UserIdentity.provider == "local", UserIdentity.subject.in_(subjects)
+            ))).scalars())
+        fresh = []
+        for line, row in accepted:
+            if row.email in taken_emails or row.subject in taken_subjects:
+                errors.append((line, "A user with this email or username already exists"))
+            else:
+                fresh.append((line, row))
+        accepted = fresh
+
+    # argon2 runs in the import process pool; rows without a password skip it
+    with_password = [row.password for _, row in accepted if row.password is not None]
+    hashes = iter(await import_hasher.hash_all(with_password)) if with_password else iter(())
+    batch = RowBatch()
+    for _, row in accepted:
+        build_rows(batch, job.tenant_id, role_ids[row.role], row, next(hashes) if row.password is not None else None)
+
+    if len(batch):
+        try:
+            async with db_engine.begin() as conn:
+                await write_batch(conn, batch)
+            job.rows_imported += len(batch)
+            IMPORT_ROWS.labels("imported").inc(len(batch))
+        except IntegrityError as exc:
+            # A concurrent writer took an email/username after our check; the batch rolls back as a whole
+            errors.extend((line, f"Batch rolled back: {exc.orig}") for line, _ in accepted)
+    job.fail_rows(sorted(errors))
+
+async def run_import(job: ImportJob, upload: IO[bytes], db_engine: AsyncEngine = engine) -> None:
+    try:
+        async with _job_slots:
+            job.status = "running"
+            job.started_at = datetime.now(timezone.utc)
+            async with db_engine.connect() as conn:
+                result = await conn.execute(select(Role.name, Role.id).where(Role.tenant_id == job.tenant_id))
+                role_ids = {name: role_id for name, role_id in result}
+            records = read_records(upload, job.format)
+            while True:
+                read, rows, errors = await asyncio.to_thread(validate_batch, records, IMPORT_BATCH_SIZE)
+                if not read:
+                    break
+                job.rows_read += read
+                job.fail_rows(errors)
+                await import_batch(db_engine, job, rows, role_ids)
+            job.status = "completed"
+    except Exception:
+        logger.exception("User import %s failed", job.id)
+        job.status = "failed"
+    finally:
+        job.finished_at = datetime.now(timezone.utc)
+        upload.close()
+        logger.info(
+            "User import %s %s: %d read, %d imported, %d failed (%s rows/s)",
+            job.id, job.status, job.rows_read, job.rows_imported, job.rows_failed, job.rows_per_second
+        )
+
+def start_import(tenant_id: uuid.UUID, format: str, upload: IO[bytes]) -> ImportJob:
+    job = ImportJob(id=uuid.uuid4(), tenant_id=tenant_id, format=format, created_at=datetime.now(timezone.utc))
+    import_jobs.set(job.id, job)
+    # Fresh context: the job outlives the request, so it mustn't report into
+    # the request's query stats or trace
+    task = asyncio.create_task(run_import(job, upload), context=contextvars.Context())
+    _running.add(task)
+    task.add_done_callback(_running.discard)
+    return job
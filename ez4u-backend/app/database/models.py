@@ -2,12 +2,13 @@ import uuid
 from datetime import datetime
 from typing import Optional, List
 from sqlalchemy import (
-    UUID, String, Boolean, DateTime, ForeignKey, 
-    UniqueConstraint, Index, Text, Table, Column, func, text
+    UUID, String, Boolean, Integer, DateTime, ForeignKey, 
+    UniqueConstraint, Index, Text, Table, Column, func, text,
+    event, inspect, select, insert, update, delete, literal, true, DDL
 )
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship, Session
 from sqlalchemy import JSON
-# from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import JSONB
 from app.database.base import Base
 
 # ----------------------------------------------------------------------
@@ -20,8 +21,9 @@ class User(Base):
     email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False, index=True)
     full_name: Mapped[Optional[str]] = mapped_column(String(255))
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+    token_version: Mapped[int] = mapped_column(Integer, default=0, server_default=text("0"), nullable=False)  # Bump to revoke issued JWTs
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
-    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     # Relationships
     identities: Mapped[List["UserIdentity"]] = relationship(back_populates="user", cascade="all, delete-orphan")
@@ -33,6 +35,17 @@ class User(Base):
     phone_numbers: Mapped[List["UserPhoneNumber"]] = relationship(back_populates="user", cascade="all, delete-orphan")
     emails: Mapped[List["UserEmail"]] = relationship(back_populates="user", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Trigram GIN indexes serve the ILIKE email-prefix / name-substring filters (Postgres only)
+        Index("ix_users_email_trgm", "email", postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"}).ddl_if(dialect="postgresql"),
+        Index("ix_users_full_name_trgm", "full_name", postgresql_using="gin", postgresql_ops={"full_name": "gin_trgm_ops"}).ddl_if(dialect="postgresql"),
+        Index("ix_users_created_at_id", "created_at", "id"),  # Keyset pagination when sorting by created_at
+        Index("ix_users_full_name_id", text("coalesce(full_name, '')"), "id"),  # ... and by full_name (NULL as "")
+    )
+
+# The trigram operator classes come from the pg_trgm extension
+event.listen(User.__table__, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"))
+
 class UserIdentity(Base):
     __tablename__ = "user_identities"
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -64,8 +77,13 @@ class UserAddress(Base):
     is_primary: Mapped[bool] = mapped_column(Boolean, default=False)
     label: Mapped[Optional[str]] = mapped_column(String(50)) # e.g., "Home", "Work"
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
-    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        # User filters by location
+        Index("ix_user_addresses_country_city_user", "country", "city", "user_id"),
+        Index("ix_user_addresses_city_user", "city", "user_id"),
+    )
     user: Mapped["User"] = relationship(back_populates="addresses")
 
 class UserPhoneNumber(Base):
@@ -77,7 +95,7 @@ class UserPhoneNumber(Base):
     label: Mapped[Optional[str]] = mapped_column(String(50))
     is_verified: Mapped[bool] = mapped_column(Boolean, default=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
-    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     user: Mapped["User"] = relationship(back_populates="phone_numbers")
 
@@ -90,7 +108,7 @@ class UserEmail(Base):
     label: Mapped[Optional[str]] = mapped_column(String(50))
     verified_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
-    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     user: Mapped["User"] = relationship(back_populates="emails")
 
@@ -106,7 +124,7 @@ class Tenant(Base):
     parent_tenant_id: Mapped[Optional[uuid.UUID]] = mapped_column(ForeignKey("tenants.id", ondelete="SET NULL"), index=True)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
-    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     # Relationships
     parent: Mapped[Optional["Tenant"]] = relationship(remote_side=[id], backref="children")
@@ -114,6 +132,18 @@ class Tenant(Base):
     tenant_members: Mapped[List["TenantMember"]] = relationship(back_populates="tenant", cascade="all, delete-orphan")
     resources: Mapped[List["Resource"]] = relationship(back_populates="tenant", cascade="all, delete-orphan")
 
+# Closure table: one row per (ancestor, descendant) pair, including (t, t, 0).
+# Subtree and ancestor-chain reads become a single indexed lookup instead of
+# one query per level. Maintained by the session hooks below.
+tenant_closure = Table(
+    "tenant_closure",
+    Base.metadata,
+    Column("ancestor_id", UUID(as_uuid=True), ForeignKey("tenants.id", ondelete="CASCADE"), primary_key=True),
+    Column("descendant_id", UUID(as_uuid=True), ForeignKey("tenants.id", ondelete="CASCADE"), primary_key=True),
+    Column("depth", Integer, nullable=False),
+    Index("ix_tenant_closure_descendant_depth", "descendant_id", "depth"),
+)
+
 class Role(Base):
     __tablename__ = "roles"
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -139,10 +169,12 @@ class TenantMember(Base):
     role_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("roles.id", ondelete="RESTRICT"), nullable=False, index=True)
     status: Mapped[str] = mapped_column(String(20), default="active")  # "active", "invited", "suspended"
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
-    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     __table_args__ = (
         UniqueConstraint("user_id", "tenant_id", name="uq_user_tenant"),  # CRITICAL: Prevent duplicate memberships
+        Index("ix_tenant_members_tenant_role_user", "tenant_id", "role_id", "user_id"),  # User filters by tenant + role
+        Index("ix_tenant_members_tenant_user", "tenant_id", "user_id"),  # Keyset order of /tenants/{id}/members
         # Index("ix_tenant_members_tenant_id", "tenant_id"), # Handled by mapped_column(index=True)
         # Index("ix_tenant_members_user_id", "user_id")      # Handled by mapped_column(index=True)
     )
@@ -213,14 +245,121 @@ class Resource(Base):
     tenant_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("tenants.id", ondelete="CASCADE"), nullable=False, index=True)
     
     name: Mapped[str] = mapped_column(String(255), nullable=False)
-    data: Mapped[dict] = mapped_column(JSON, nullable=True) # Flexible schema, removed server_default for SQLite compat
+    # Flexible schema: JSONB on Postgres (GIN-indexed, queried in the database), JSON text elsewhere
+    data: Mapped[dict] = mapped_column(JSON().with_variant(JSONB(), "postgresql"), nullable=True) # Removed server_default for SQLite compat
     
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
-    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     # Relationships
     tenant: Mapped["Tenant"] = relationship(back_populates="resources")
 
+    __table_args__ = (
+        Index("ix_resources_tenant_id_id", "tenant_id", "id"),  # Keyset order of resource listings and exports
+        # Default jsonb_ops: serves @> containment, ? key existence and @? path filters
+        Index("ix_resources_data_gin", "data", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
+
+# ----------------------------------------------------------------------
+# TENANT HIERARCHY MAINTENANCE (tenant_closure)
+# Runs inside the flush transaction, so the closure always commits together
+# with the adjacency list. Core INSERT/UPDATEs on tenants bypass these hooks;
+# call rebuild_tenant_closure() afterwards.
+# ----------------------------------------------------------------------
+
+def _attach_subtree(connection, root_id: uuid.UUID, parent_id: uuid.UUID) -> None:
+    # Link every ancestor of the new parent to every node of root's subtree
+    ancestors = tenant_closure.alias("ancestors")
+    subtree = tenant_closure.alias("subtree")
+    connection.execute(insert(tenant_closure).from_select(
+        ["ancestor_id", "descendant_id", "depth"],
+        select(ancestors.c.ancestor_id, subtree.c.descendant_id, ancestors.c.depth + subtree.c.depth + 1)
+        .select_from(ancestors).join(subtree, true())  # Intentional cross product
+        .where(ancestors.c.descendant_id == parent_id, subtree.c.ancestor_id == root_id)
+    ))
+
+def _detach_subtree(connection, root_id: uuid.UUID) -> None:
+    # Drop links from nodes outside root's subtree into it; root becomes a tree root
+    subtree_ids = select(tenant_closure.c.descendant_id).where(tenant_closure.c.ancestor_id == root_id)
+    connection.execute(delete(tenant_closure).where(
+        tenant_closure.c.descendant_id.in_(subtree_ids),
+        tenant_closure.c.ancestor_id.not_in(subtree_ids)
+    ))
+
+@event.listens_for(Session, "after_flush")
+def _maintain_tenant_closure(session: Session, flush_context) -> None:
+    new = [obj for obj in session.new if isinstance(obj, Tenant)]
+    moved = [
+        obj for obj in session.dirty
+        if isinstance(obj, Tenant) and inspect(obj).attrs.parent_tenant_id.history.has_changes()
+    ]
+    deleted = [obj.id for obj in session.deleted if isinstance(obj, Tenant)]
+    if not (new or moved or deleted):
+        return
+    connection = session.connection()
+
+    if deleted:
+        # FK cascades cover Postgres; SQLite doesn't enforce them by default
+        connection.execute(delete(tenant_closure).where(
+            tenant_closure.c.ancestor_id.in_(deleted) | tenant_closure.c.descendant_id.in_(deleted)
+        ))
+
+    # Parents before children, so each node can copy its parent's ancestor rows
+    pending = {obj.id: obj for obj in new}
+    while pending:
+        ready = [obj for obj in pending.values() if obj.parent_tenant_id not in pending]
+        for obj in ready:
+            connection.execute(insert(tenant_closure).values(ancestor_id=obj.id, descendant_id=obj.id, depth=0))
+            if obj.parent_tenant_id is not None:
+                _attach_subtree(connection, obj.id, obj.parent_tenant_id)
+            del pending[obj.id]
+
+    # Moves run after inserts so children added under a moving node travel with it
+    for obj in moved:
+        if obj.parent_tenant_id is not None:
+            cycle = connection.execute(select(tenant_closure.c.depth).where(
+                tenant_closure.c.ancestor_id == obj.id,
+                tenant_closure.c.descendant_id == obj.parent_tenant_id
+            )).first()
+            if cycle is not None:
+                raise ValueError(f"Tenant {obj.id} cannot be moved under its own descendant")
+        _detach_subtree(connection, obj.id)
+        if obj.parent_tenant_id is not None:
+            _attach_subtree(connection, obj.id, obj.parent_tenant_id)
+
+def rebuild_tenant_closure(connection) -> None:
+    # Recomputes the whole closure from tenants.parent_tenant_id (sync connection)
+    tree = select(
+        Tenant.id.label("ancestor_id"), Tenant.id.label("descendant_id"), literal(0).label("depth")
+    ).cte("tree", recursive=True)
+    tree = tree.union_all(
+        select(tree.c.ancestor_id, Tenant.id, tree.c.depth + 1)
+        .where(Tenant.parent_tenant_id == tree.c.descendant_id)
+    )
+    connection.execute(delete(tenant_closure))
+    connection.execute(insert(tenant_closure).from_select(
+        ["ancestor_id", "descendant_id", "depth"],
+        select(tree.c.ancestor_id, tree.c.descendant_id, tree.c.depth)
+    ))
+
+# ----------------------------------------------------------------------
+# USER PROFILE TIMESTAMPS
+# Addresses, phone numbers and emails are part of the user listing, so their
+# changes bump users.updated_at too; the listing ETags are derived from it.
+# ----------------------------------------------------------------------
+
+@event.listens_for(Session, "after_flush")
+def _touch_profile_owners(session: Session, flush_context) -> None:
+    owners = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, (UserAddress, UserPhoneNumber, UserEmail)):
+            # A row moved to another user changes both listings
+            owners.update(inspect(obj).attrs.user_id.history.deleted)
+            owners.add(obj.user_id)
+    owners.discard(None)
+    if owners:
+        session.connection().execute(update(User).where(User.id.in_(owners)).values(updated_at=func.now()))
+
 # ----------------------------------------------------------------------
 # RLS POLICY (SQL COMMENT)
 # ----------------------------------------------------------------------
@@ -243,4 +382,7 @@ USING (
 -- SET app.current_tenant_id = '<tenant_uuid>';
 -- SET app.current_user_id = '<user_uuid>';
 -- VALIDATE MEMBERSHIP BEFORE SETTING CONTEXT (prevent spoofing)
+-- (Done per transaction by the get_tenant_db / get_tenant_read_db dependencies in app/core/tenancy.py)
+-- Not created by the Alembic migrations yet: until it is, get_tenant_context
+-- (app/core/tenancy.py) checks the active membership in tenant_members itself.
 """
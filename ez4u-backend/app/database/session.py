@@ -0,0 +1,153 @@
+import itertools
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List
+
+from fastapi import Depends, Request
+from prometheus_client import Counter
+from sqlalchemy import event, func, select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+
+from app.database.base import AsyncSessionLocal, replica_engines
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+# How long a replica that failed to connect is skipped before being retried
+DB_REPLICA_RETRY_SECONDS = float(os.getenv("DB_REPLICA_RETRY_SECONDS", "30"))
+
+REPLICA_FAILOVERS = Counter(
+    "ez4u_db_replica_failovers_total",
+    "Read sessions that skipped a replica because it could not be reached",
+    ["replica"],
+)
+
+class ReplicaRouter:
+    """Round-robins read sessions over healthy replicas."""
+
+    def __init__(self, engines: List[AsyncEngine], retry_seconds: float = DB_REPLICA_RETRY_SECONDS):
+        self.engines = engines
+        self.retry_seconds = retry_seconds
+        self._counter = itertools.count()
+        self._down_until: dict[int, float] = {}
+
+    def candidates(self) -> List[AsyncEngine]:
+        # Healthy replicas, starting from the next one in rotation
+        if not self.engines:
+            return []
+        start = next(self._counter) % len(self.engines)
+        rotated = self.engines[start:] + self.engines[:start]
+        now = time.monotonic()
+        return [replica for replica in rotated if self._down_until.get(id(replica), 0.0) <= now]
+
+    def mark_down(self, replica: AsyncEngine) -> None:
+        self._down_until[id(replica)] = time.monotonic() + self.retry_seconds
+        REPLICA_FAILOVERS.labels(str(self.engines.index(replica))).inc()
+
+replica_router = ReplicaRouter(replica_engines)
+
+@asynccontextmanager
+async def read_session() -> AsyncIterator[AsyncSession]:
+    # Checking out a connection up front (pre-ping validates it) lets us fail
+    # over before the request runs; the primary is the last resort.
+    session = None
+    for replica in replica_router.candidates():
+        candidate = AsyncSessionLocal(bind=replica)
+        try:
+            await candidate.connection()
+        except (DBAPIError, OSError):
+            logger.warning("Read replica %s unavailable, failing over", replica.url.render_as_string(hide_password=True))
+            await candidate.close()
+            replica_router.mark_down(replica)
+            continue
+        session = candidate
+        break
+    if session is None:
+        session = AsyncSessionLocal()
+
+    try:
+        yield session
+    finally:
+        await session.close()
+
+# ----------------------------------------------------------------------
+# DEPENDENCIES
+# One session per request: FastAPI caches dependencies per request, and
+# get_db/get_read_db both resolve to get_request_db, so the auth, permission
+# and tenant dependencies and the route itself all share it. Whether it is a
+# replica or primary session depends on the route, not on which dependency
+# asks first.
+# ----------------------------------------------------------------------
+
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+def _declares_get_db(dependant) -> bool:
+    return any(dep.call is get_db or _declares_get_db(dep) for dep in dependant.dependencies)
+
+def _needs_primary(request: Request) -> bool:
+    # Unsafe methods, and routes that declare get_db anywhere in their
+    # dependency tree, run on the primary. Decided before the session opens so
+    # a request never checks out a replica connection it would then abandon.
+    if request.method not in READ_METHODS:
+        return True
+    route = request.scope.get("route")
+    if route is None or not hasattr(route, "dependant"):
+        return False
+    needs_primary = getattr(route, "_needs_primary_db", None)
+    if needs_primary is None:
+        # Remembered on the route (APIRoute isn't hashable); its dependencies are fixed
+        needs_primary = route._needs_primary_db = _declares_get_db(route.dependant)
+    return needs_primary
+
+async def get_request_db(request: Request):
+    if _needs_primary(request):
+        async with AsyncSessionLocal() as db:
+            yield db
+    else:
+        async with read_session() as db:
+            yield db
+
+# Routes that write (and login) declare get_db: the request's session is opened on the primary
+async def get_db(db: AsyncSession = Depends(get_request_db)):
+    return db
+
+# Read-only endpoints
+async def get_read_db(db: AsyncSession = Depends(get_request_db)):
+    return db
+
+# ----------------------------------------------------------------------
+# ROW LEVEL SECURITY CONTEXT
+# See the RLS policy at the bottom of app/database/models.py. The GUCs are set
+# with set_config(..., is_local => true), i.e. SET LOCAL, once when each
+# transaction begins, so they never leak to other requests sharing the pooled
+# connection and cost no extra round-trip per statement.
+# ----------------------------------------------------------------------
+
+RLS_CONTEXT_KEY = "rls_context"
+
+def _set_rls_gucs(connection, tenant_id: str, user_id: str) -> None:
+    if connection.dialect.name != "postgresql":
+        return  # SQLite (TEST_MODE) has no RLS
+    connection.execute(select(
+        func.set_config("app.current_tenant_id", tenant_id, True),
+        func.set_config("app.current_user_id", user_id, True),
+    ))
+
+@event.listens_for(Session, "after_begin")
+def _apply_rls_context(session: Session, transaction, connection) -> None:
+    context = session.info.get(RLS_CONTEXT_KEY)
+    if context is not None:
+        _set_rls_gucs(connection, *context)
+
+async def set_rls_context(db: AsyncSession, tenant_id, user_id) -> None:
+    # Caller must have validated the membership first (prevents spoofing)
+    context = (str(tenant_id), str(user_id))
+    db.info[RLS_CONTEXT_KEY] = context
+    if db.in_transaction():
+        # Already begun: after_begin won't fire again for this transaction
+        connection = await db.connection()
+        await connection.run_sync(_set_rls_gucs, *context)
@@ -1,16 +1,33 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from prometheus_client import make_asgi_app
+from prometheus_fastapi_instrumentator import Instrumentator, metrics
 from pydantic import BaseModel
 from datetime import datetime
 
+from app.core.hashing import password_hash_pool, HashPoolSaturated, HASH_RETRY_AFTER_SECONDS
+from app.core.query_metrics import QueryStatsMiddleware, db_query_metrics, QUERY_STATS_HEADERS
+from app.core.tracing import TracingMiddleware, configure_tracing
+from app.core.user_import import import_hasher
+
 # Import routers
-from app.routers import auth, users, tenants
+from app.routers import auth, users, tenants, resources, imports, exports
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Let in-flight hashes finish before the worker exits
+    password_hash_pool.shutdown()
+    import_hasher.close()
 
 # Create FastAPI app instance
 app = FastAPI(
     title="Ez4u Backend API",
     description="FastAPI backend for Ez4u SaaS application",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -20,12 +37,39 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", *QUERY_STATS_HEADERS],  # Keyset pagination cursor, list validators, dev query stats
 )
 
+# HTTP and per-request DB metrics, labelled by route template. The query stats
+# middleware is added last so it wraps the instrumentator and its stats are
+# already on request.state when the instrumentator records them.
+Instrumentator(excluded_handlers=["/metrics"]).add(metrics.default()).add(db_query_metrics()).instrument(app)
+app.add_middleware(QueryStatsMiddleware)
+
+# OpenTelemetry: no-op unless OTEL_TRACES_EXPORTER is set; outermost so the
+# request span covers every other middleware
+configure_tracing()
+app.add_middleware(TracingMiddleware)
+
+# Prometheus metrics (password hashing pool, DB pools, HTTP, ...)
+app.mount("/metrics", make_asgi_app())
+
+# Shed login/hashing load instead of queueing unboundedly
+@app.exception_handler(HashPoolSaturated)
+async def hash_pool_saturated_handler(request: Request, exc: HashPoolSaturated):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server is busy, please retry shortly"},
+        headers={"Retry-After": str(HASH_RETRY_AFTER_SECONDS)},
+    )
+
 # Include Routers
 app.include_router(auth.router, prefix="/api", tags=["auth"])
 app.include_router(users.router, prefix="/api", tags=["users"])
 app.include_router(tenants.router, prefix="/api", tags=["tenants"])
+app.include_router(resources.router, prefix="/api", tags=["resources"])
+app.include_router(imports.router, prefix="/api", tags=["imports"])
+app.include_router(exports.router, prefix="/api", tags=["exports"])
 
 # Pydantic model for response
 class HealthResponse(BaseModel):
@@ -5,22 +5,17 @@ from fastapi.security import OAuth2PasswordBearer
 from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from jose import JWTError, jwt
 
-from app.database.base import AsyncSessionLocal
+from app.database.session import get_db
 from app.database.models import User, UserIdentity
-from app.core.security import verify_password, create_access_token, SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
+from app.core.authentication import get_current_user
+from app.core.security import create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES
+from app.core.hashing import verify_password_async
+from app.core.rate_limit import login_rate_limiter
+from app.core.principal import AuthenticatedUser, principal_cache, load_principal, principal_claims
 
 router = APIRouter()
 
-# Dependency
-async def get_db():
-    async with AsyncSessionLocal() as db:
-        try:
-            yield db
-        finally:
-            await db.close()
-
 # Pydantic Models
 class LoginRequest(BaseModel):
     username: str
@@ -37,60 +32,37 @@ class Token(BaseModel):
     token_type: str
 
 # Auth Logic
-async def authenticate_user(db: AsyncSession, username: str, password: str):
-    stmt = select(UserIdentity).where(
-        UserIdentity.provider == "local", 
+def local_identity_user_query(username: str):
+    # Identity -> user resolution in a single round-trip
+    return select(UserIdentity, User).join(User, User.id == UserIdentity.user_id).where(
+        UserIdentity.provider == "local",
         UserIdentity.subject == username
     )
-    result = await db.execute(stmt)
-    identity = result.scalar_one_or_none()
+
+async def authenticate_user(db: AsyncSession, username: str, password: str):
+    result = await db.execute(local_identity_user_query(username))
+    row = result.one_or_none()
     
-    if not identity or not identity.password_hash:
+    if row is None or not row.UserIdentity.password_hash:
         return False
-    if not verify_password(password, identity.password_hash):
+    # argon2 runs in the hashing pool so a login burst can't stall the event loop
+    if not await verify_password_async(password, row.UserIdentity.password_hash):
         return False
     
-    # Fetch full user
-    user_stmt = select(User).where(User.id == identity.user_id)
-    user_result = await db.execute(user_stmt)
-    return user_result.scalar_one()
-
-async def get_current_user(request: Request, db: AsyncSession = Depends(get_db)):
-    token = request.cookies.get("access_token")
-    if not token:
-        # Fallback to header for API testing tools
-        auth_header = request.headers.get("Authorization")
-        if auth_header and auth_header.startswith("Bearer "):
-            token = auth_header.split(" ")[1]
-    
-    if not token:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
-
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: Optional[str] = payload.get("sub")
-        if username is None:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    except JWTError:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-
-    # In a real app, we might verify user still exists in DB
-    # For now, we trust the token or do a quick lookup
-    # We used 'username' (subject) as 'sub'. But wait, our 'subject' in UserIdentity is the username.
-    # We need to find the user associated with this subject.
-    stmt = select(UserIdentity).where(UserIdentity.subject == username, UserIdentity.provider == "local")
-    result = await db.execute(stmt)
-    identity = result.scalar_one_or_none()
-    if identity is None:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-        
-    user_stmt = select(User).where(User.id == identity.user_id)
-    user_result = await db.execute(user_stmt)
-    return user_result.scalar_one()
+    return row.User
 
 # Routes
 @router.post("/login")
-async def login(form_data: LoginRequest, response: Response, db: AsyncSession = Depends(get_db)):
+async def login(form_data: LoginRequest, request: Request, response: Response, db: AsyncSession = Depends(get_db)):
+    # Shed brute-force and credential-stuffing bursts before the DB lookup and argon2
+    retry_after = await login_rate_limiter.check(request.client.host if request.client else None, form_data.username)
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, please retry later",
+            headers={"Retry-After": str(retry_after)},
+        )
+
     user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
@@ -99,9 +71,13 @@ async def login(form_data: LoginRequest, response: Response, db: AsyncSession =
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Embed user id and token version so later requests skip the DB
+    principal = await load_principal(db, form_data.username)
+    principal_cache.set(form_data.username, principal)
+    
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        subject=form_data.username, expires_delta=access_token_expires
+        subject=form_data.username, expires_delta=access_token_expires, claims=principal_claims(principal)
     )
     
     # Set HttpOnly Cookie
@@ -122,7 +98,7 @@ async def logout(response: Response):
     return {"message": "Logged out successfully"}
 
 @router.get("/me", response_model=UserResponse)
-async def read_users_me(current_user: User = Depends(get_current_user)):
+async def read_users_me(current_user: AuthenticatedUser = Depends(get_current_user)):
     return {
         "id": str(current_user.id),
         "email": current_user.email,
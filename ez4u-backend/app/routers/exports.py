@@ -0,0 +1,87 @@
+from typing import List, Literal, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.data_export import cursor_chunks, export_response
+from app.core.data_filters import DataFilter
+from app.core.permissions import require_permission
+from app.core.principal import AuthenticatedUser
+from app.core.serialization import response_columns
+from app.core.tenancy import get_tenant_read_db
+from app.core.user_import import CSV_ADDRESS_COLUMNS
+from app.database.models import User, TenantMember, Role, Resource
+from app.routers.resources import ResourceResponse, data_filter_params, filter_resources
+from app.routers.users import USER_CHILDREN, UserDetailResponse, attach_user_children
+
+router = APIRouter()
+
+ExportFormat = Literal["ndjson", "csv"]
+
+# Pydantic Models
+class UserExportResponse(UserDetailResponse):
+    role: str
+
+# CSV has no nesting: resource data is a JSON cell, and users carry their
+# primary address and phone number in the import's flat columns
+RESOURCE_CSV_COLUMNS = ("id", "name", "data", "created_at", "updated_at")
+USER_CSV_COLUMNS = ("id", "email", "full_name", "role", "is_active", "created_at", "updated_at", *CSV_ADDRESS_COLUMNS, "phone_number")
+
+def primary(items: List[dict]) -> dict:
+    return next((item for item in items if item["is_primary"]), items[0] if items else {})
+
+def user_csv_row(user: dict) -> dict:
+    address = primary(user["addresses"])
+    return {
+        **user,
+        **{column: address.get(column) for column in CSV_ADDRESS_COLUMNS},
+        "phone_number": primary(user["phone_numbers"]).get("phone_number"),
+    }
+
+# Keyset order on the primary key, so an interrupted export resumes with
+# ?after=<id of the last row received>
+def users_export_query(tenant_id: UUID, after: Optional[UUID]):
+    stmt = (
+        select(*response_columns(User, UserExportResponse), Role.name.label("role"))
+        .join(TenantMember, TenantMember.user_id == User.id)
+        .join(Role, Role.id == TenantMember.role_id)
+        .where(TenantMember.tenant_id == tenant_id)
+        .order_by(TenantMember.user_id)
+    )
+    if after is not None:
+        stmt = stmt.where(TenantMember.user_id > after)
+    return stmt
+
+async def user_export_chunks(db: AsyncSession, tenant_id: UUID, after: Optional[UUID]):
+    # Children are loaded per chunk while the cursor stays open
+    async for users in cursor_chunks(db, users_export_query(tenant_id, after)):
+        await attach_user_children(db, users, list(USER_CHILDREN))
+        yield users
+
+@router.get("/tenants/{tenant_id}/export/resources")
+async def export_resources(
+    tenant_id: UUID,
+    request: Request,
+    format: ExportFormat = Query("ndjson", description="ndjson or csv; gzipped when the client accepts it"),
+    after: Optional[UUID] = Query(None, description="Resume after this resource id"),
+    filters: List[DataFilter] = Depends(data_filter_params),
+    current_user: AuthenticatedUser = Depends(require_permission("data.export")),
+    db: AsyncSession = Depends(get_tenant_read_db)
+):
+    stmt = filter_resources(select(*response_columns(Resource, ResourceResponse)), tenant_id, filters, db.get_bind().dialect.name, after)
+    chunks = cursor_chunks(db, stmt)
+    return export_response(request, "resources", format, chunks, ResourceResponse, RESOURCE_CSV_COLUMNS)
+
+@router.get("/tenants/{tenant_id}/export/users")
+async def export_users(
+    tenant_id: UUID,
+    request: Request,
+    format: ExportFormat = Query("ndjson", description="ndjson or csv; gzipped when the client accepts it"),
+    after: Optional[UUID] = Query(None, description="Resume after this user id"),
+    current_user: AuthenticatedUser = Depends(require_permission("data.export")),
+    db: AsyncSession = Depends(get_tenant_read_db)
+):
+    chunks = user_export_chunks(db, tenant_id, after)
+    return export_response(request, "users", format, chunks, UserExportResponse, USER_CSV_COLUMNS, user_csv_row)
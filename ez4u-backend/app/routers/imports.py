@@ -0,0 +1,64 @@
+import tempfile
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.permissions import require_permission
+from app.core.principal import AuthenticatedUser
+from app.core.user_import import (
+    IMPORT_FORMATS, IMPORT_MAX_BYTES, IMPORT_SPOOL_MEMORY_BYTES, ImportJob, import_jobs, start_import
+)
+from app.database.session import get_db
+from app.database.models import Tenant
+
+router = APIRouter()
+
+@router.post("/tenants/{tenant_id}/import", response_model=ImportJob, status_code=status.HTTP_202_ACCEPTED)
+async def import_users(
+    tenant_id: UUID,
+    request: Request,
+    response: Response,
+    current_user: AuthenticatedUser = Depends(require_permission("user.manage")),
+    db: AsyncSession = Depends(get_db)
+):
+    # Body is CSV (text/csv) or NDJSON (application/x-ndjson), one user per row/line
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    format = IMPORT_FORMATS.get(content_type)
+    if format is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Expected one of: {', '.join(IMPORT_FORMATS)}",
+        )
+    if await db.get(Tenant, tenant_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tenant not found")
+
+    # Spool the stream (memory first, then disk) so the job can outlive the request
+    upload = tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_MEMORY_BYTES)
+    try:
+        async for chunk in request.stream():
+            upload.write(chunk)
+            if upload.tell() > IMPORT_MAX_BYTES:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"Imports are limited to {IMPORT_MAX_BYTES} bytes",
+                )
+    except BaseException:
+        upload.close()
+        raise
+    upload.seek(0)
+
+    job = start_import(tenant_id, format, upload)
+    response.headers["Location"] = f"{request.url.path}/{job.id}"
+    return job
+
+@router.get("/tenants/{tenant_id}/import/{job_id}", response_model=ImportJob)
+async def read_import_job(
+    tenant_id: UUID,
+    job_id: UUID,
+    current_user: AuthenticatedUser = Depends(require_permission("user.manage"))
+):
+    job = import_jobs.get(job_id)
+    if job is None or job.tenant_id != tenant_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Import job not found")
+    return job
@@ -0,0 +1,139 @@
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from pydantic import BaseModel, ConfigDict, Field
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.data_filters import DataFilter, data_filter_clause, parse_data_filters
+from app.core.http_cache import list_validators, not_modified, query_validators, revalidating
+from app.core.permissions import require_permission
+from app.core.principal import AuthenticatedUser
+from app.core.serialization import RowsJSONResponse, response_columns
+from app.core.tenancy import get_tenant_db, get_tenant_read_db
+from app.database.models import Resource
+from app.routers.users import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
+
+router = APIRouter()
+
+# Pydantic Models
+class ResourceResponse(BaseModel):
+    id: UUID
+    name: str
+    data: Optional[Dict[str, Any]] = None
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+class ResourceCreate(BaseModel):
+    name: str = Field(min_length=1, max_length=255)
+    data: Dict[str, Any] = {}
+
+class ResourceUpdate(BaseModel):
+    name: Optional[str] = Field(None, min_length=1, max_length=255)
+    data: Optional[Dict[str, Any]] = None  # Replaces the whole document
+
+def data_filter_params(
+    filters: List[str] = Query(
+        [], alias="filter",
+        description="Condition on data, repeatable: status=active, specs.size>=10, tags=[\"red\"], owner (key exists)",
+    ),
+) -> List[DataFilter]:
+    return parse_data_filters(filters)
+
+def filter_resources(stmt, tenant_id: UUID, filters: List[DataFilter], dialect: str, after: Optional[UUID]):
+    # The tenant filter is explicit as well as enforced by RLS: it keeps the
+    # keyset on the (tenant_id, id) index, and SQLite has no RLS
+    stmt = stmt.where(Resource.tenant_id == tenant_id)
+    for data_filter in filters:
+        stmt = stmt.where(data_filter_clause(Resource.data, data_filter, dialect))
+    if after is not None:
+        stmt = stmt.where(Resource.id > after)
+    return stmt.order_by(Resource.id)
+
+@router.get("/tenants/{tenant_id}/resources", response_model=List[ResourceResponse])
+async def read_resources(
+    tenant_id: UUID,
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of resources to return"),
+    after: Optional[UUID] = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
+    filters: List[DataFilter] = Depends(data_filter_params),
+    current_user: AuthenticatedUser = Depends(require_permission("data.view")),
+    db: AsyncSession = Depends(get_tenant_read_db)
+):
+    # Filters run in the database; blobs are only loaded for the page returned
+    dialect = db.get_bind().dialect.name
+    if revalidating(request):
+        stmt = filter_resources(select(Resource.id, Resource.updated_at), tenant_id, filters, dialect, after).limit(limit)
+        if (unchanged := not_modified(request, await query_validators(db, stmt))) is not None:
+            return unchanged
+
+    stmt = filter_resources(select(*response_columns(Resource, ResourceResponse)), tenant_id, filters, dialect, after)
+    rows = [dict(row._mapping) for row in await db.execute(stmt.limit(limit))]
+    headers = list_validators((row["id"], row["updated_at"]) for row in rows).headers()
+    if len(rows) == limit:
+        headers[NEXT_CURSOR_HEADER] = str(rows[-1]["id"])
+    return RowsJSONResponse(ResourceResponse, rows, headers=headers)
+
+@router.post("/tenants/{tenant_id}/resources", response_model=ResourceResponse, status_code=status.HTTP_201_CREATED)
+async def create_resource(
+    tenant_id: UUID,
+    resource_in: ResourceCreate,
+    current_user: AuthenticatedUser = Depends(require_permission("data.edit")),
+    db: AsyncSession = Depends(get_tenant_db)
+):
+    resource = Resource(tenant_id=tenant_id, name=resource_in.name, data=resource_in.data)
+    db.add(resource)
+    await db.commit()
+    await db.refresh(resource)  # Server-side timestamps
+    return resource
+
+@router.get("/tenants/{tenant_id}/resources/{resource_id}", response_model=ResourceResponse)
+async def read_resource(
+    tenant_id: UUID,
+    resource_id: UUID,
+    current_user: AuthenticatedUser = Depends(require_permission("data.view")),
+    db: AsyncSession = Depends(get_tenant_read_db)
+):
+    row = (await db.execute(
+        select(*response_columns(Resource, ResourceResponse))
+        .where(Resource.tenant_id == tenant_id, Resource.id == resource_id)
+    )).first()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Resource not found")
+    return row._mapping
+
+@router.patch("/tenants/{tenant_id}/resources/{resource_id}", response_model=ResourceResponse)
+async def update_resource(
+    tenant_id: UUID,
+    resource_id: UUID,
+    resource_in: ResourceUpdate,
+    current_user: AuthenticatedUser = Depends(require_permission("data.edit")),
+    db: AsyncSession = Depends(get_tenant_db)
+):
+    resource = await db.scalar(select(Resource).where(Resource.tenant_id == tenant_id, Resource.id == resource_id))
+    if resource is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Resource not found")
+    for field, value in resource_in.model_dump(exclude_unset=True).items():
+        if value is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"{field} can't be null")
+        setattr(resource, field, value)
+    await db.commit()
+    await db.refresh(resource)  # onupdate bumped updated_at
+    return resource
+
+@router.delete("/tenants/{tenant_id}/resources/{resource_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_resource(
+    tenant_id: UUID,
+    resource_id: UUID,
+    current_user: AuthenticatedUser = Depends(require_permission("data.edit")),
+    db: AsyncSession = Depends(get_tenant_db)
+):
+    result = await db.execute(delete(Resource).where(Resource.tenant_id == tenant_id, Resource.id == resource_id))
+    if result.rowcount == 0:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Resource not found")
+    await db.commit()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
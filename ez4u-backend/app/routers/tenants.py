@@ -2,24 +2,26 @@ from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import aliased, selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.base import AsyncSessionLocal
-from app.database.models import Tenant
+from app.core.permissions import require_permission
+from app.core.principal import AuthenticatedUser
+from app.core.response_cache import CachedRoute, cache_response
+from app.core.http_cache import list_validators, not_modified, query_validators, revalidating
+from app.core.serialization import FAST_LIST_RESPONSES, RowsJSONResponse, parse_fields, response_columns
+from app.core.tenancy import get_tenant_read_db
+from app.database.session import get_db
+from app.database.models import Tenant, TenantMember, User, Role, tenant_closure
+from app.routers.users import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
 
-router = APIRouter()
-
-# Dependency
-async def get_db():
-    async with AsyncSessionLocal() as db:
-        try:
-            yield db
-        finally:
-            await db.close()
+# Endpoints marked @cache_response are served from the response cache. Their
+# misses read the primary (get_db): a lagging replica's answer would otherwise
+# be cached for the whole TTL after the write that invalidated it
+router = APIRouter(route_class=CachedRoute)
 
 # Pydantic Models
 class TenantResponse(BaseModel):
@@ -33,19 +35,175 @@ class TenantResponse(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+class TenantTreeNodeResponse(TenantResponse):
+    depth: int  # Distance from the requested tenant
+
+class TenantMemberResponse(BaseModel):
+    id: UUID  # Membership id, also the pagination cursor
+    tenant_id: UUID
+    user_id: UUID
+    email: str
+    full_name: Optional[str] = None
+    is_active: bool
+    role_id: UUID
+    role_name: str
+    status: str
+    joined_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+class RoleResponse(BaseModel):
+    id: UUID
+    name: str
+    description: Optional[str] = None
+    is_system_role: bool
+    permissions: List[str]  # Permission names, e.g. "data.view"
+
 @router.get("/tenants", response_model=List[TenantResponse])
+@cache_response("tenants")
 async def read_tenants(
+    request: Request,
+    response: Response,
     parent_id: Optional[UUID] = Query(None, description="Filter by parent tenant ID"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,name"),
     db: AsyncSession = Depends(get_db)
 ):
-    query = select(Tenant)
+    # Row path selects just the (requested) response columns and skips model validation;
+    # id and updated_at always come along for the ETag (extra keys aren't serialised)
+    projection = parse_fields(fields, TenantResponse)
+    use_rows = FAST_LIST_RESPONSES or projection is not None
+    if use_rows:
+        columns = response_columns(Tenant, TenantResponse, projection)
+        selected = {column.key for column in columns}
+        query = select(*columns, *(c for c in (Tenant.id, Tenant.updated_at) if c.key not in selected))
+    else:
+        query = select(Tenant)
     
     if parent_id:
-        query = query.where(Tenant.parent_tenant_id == parent_id)
+        scope = Tenant.parent_tenant_id == parent_id
     else:
         # If no parent_id is provided, return root tenants (where parent_tenant_id is NULL)
-        query = query.where(Tenant.parent_tenant_id.is_(None))
-        
-    result = await db.execute(query)
+        scope = Tenant.parent_tenant_id.is_(None)
+
+    # Conditional GET: answer 304 from the (id, updated_at) pairs alone
+    if revalidating(request):
+        validators = await query_validators(db, select(Tenant.id, Tenant.updated_at).where(scope))
+        if (unchanged := not_modified(request, validators)) is not None:
+            return unchanged
+
+    result = await db.execute(query.where(scope))
+    if use_rows:
+        rows = [dict(row._mapping) for row in result]
+        headers = list_validators((row["id"], row["updated_at"]) for row in rows).headers()
+        return RowsJSONResponse(TenantResponse, rows, headers=headers, fields=projection)
     tenants = result.scalars().all()
+    response.headers.update(list_validators((tenant.id, tenant.updated_at) for tenant in tenants).headers())
     return tenants
+
+def tenant_tree_nodes(rows) -> List[TenantTreeNodeResponse]:
+    return [
+        TenantTreeNodeResponse(**{field: getattr(tenant, field) for field in TenantResponse.model_fields}, depth=depth)
+        for tenant, depth in rows
+    ]
+
+@router.get("/tenants/{tenant_id}/subtree", response_model=List[TenantTreeNodeResponse])
+@cache_response("tenants")
+async def read_tenant_subtree(
+    tenant_id: UUID,
+    max_depth: Optional[int] = Query(None, ge=0, description="Limit how many levels below the tenant are returned"),
+    db: AsyncSession = Depends(get_db)
+):
+    # Whole subtree (tenant itself at depth 0) in one indexed closure lookup
+    query = (
+        select(Tenant, tenant_closure.c.depth)
+        .join(tenant_closure, tenant_closure.c.descendant_id == Tenant.id)
+        .where(tenant_closure.c.ancestor_id == tenant_id)
+        .order_by(tenant_closure.c.depth, Tenant.name)
+    )
+    if max_depth is not None:
+        query = query.where(tenant_closure.c.depth <= max_depth)
+
+    result = await db.execute(query)
+    rows = result.all()
+    if not rows:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tenant not found")
+    return tenant_tree_nodes(rows)
+
+@router.get("/tenants/{tenant_id}/ancestors", response_model=List[TenantTreeNodeResponse])
+@cache_response("tenants")
+async def read_tenant_ancestors(
+    tenant_id: UUID,
+    include_self: bool = Query(False, description="Include the tenant itself at depth 0"),
+    db: AsyncSession = Depends(get_db)
+):
+    # Ancestor chain ordered root first, e.g. for breadcrumbs
+    query = (
+        select(Tenant, tenant_closure.c.depth)
+        .join(tenant_closure, tenant_closure.c.ancestor_id == Tenant.id)
+        .where(tenant_closure.c.descendant_id == tenant_id)
+        .order_by(tenant_closure.c.depth.desc())
+    )
+    result = await db.execute(query)
+    rows = result.all()
+    if not rows:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tenant not found")
+    return tenant_tree_nodes(row for row in rows if include_self or row.depth > 0)
+
+@router.get("/tenants/{tenant_id}/roles", response_model=List[RoleResponse])
+async def read_tenant_roles(tenant_id: UUID, db: AsyncSession = Depends(get_tenant_read_db)):
+    # Role catalog with permission names, for the tenant's members only. Not
+    # response-cached: a hit would skip the membership check
+    result = await db.execute(
+        select(Role).where(Role.tenant_id == tenant_id).options(selectinload(Role.permissions)).order_by(Role.name)
+    )
+    roles = result.scalars().all()
+    return [
+        RoleResponse(
+            id=role.id, name=role.name, description=role.description, is_system_role=role.is_system_role,
+            permissions=sorted(permission.name for permission in role.permissions),
+        )
+        for role in roles
+    ]
+
+def tenant_members_query(tenant_id: UUID, include_subtree: bool, role_id: Optional[UUID], after: Optional[UUID]):
+    # Membership rows joined to their user and role by primary key. Ordered by
+    # (tenant_id, user_id) so a single tenant's page is a range scan of
+    # ix_tenant_members_tenant_user; the cursor is the last membership id.
+    stmt = (
+        select(
+            TenantMember.id, TenantMember.tenant_id, TenantMember.user_id, User.email, User.full_name,
+            User.is_active, TenantMember.role_id, Role.name.label("role_name"), TenantMember.status,
+            TenantMember.created_at.label("joined_at"),
+        )
+        .join(User, User.id == TenantMember.user_id)
+        .join(Role, Role.id == TenantMember.role_id)
+        .order_by(TenantMember.tenant_id, TenantMember.user_id)
+    )
+    if include_subtree:
+        subtree = select(tenant_closure.c.descendant_id).where(tenant_closure.c.ancestor_id == tenant_id)
+        stmt = stmt.where(TenantMember.tenant_id.in_(subtree))
+    else:
+        stmt = stmt.where(TenantMember.tenant_id == tenant_id)
+    if role_id is not None:
+        stmt = stmt.where(TenantMember.role_id == role_id)
+    if after is not None:
+        cursor = aliased(TenantMember)
+        last = select(cursor.tenant_id, cursor.user_id).where(cursor.id == after).scalar_subquery()
+        stmt = stmt.where(tuple_(TenantMember.tenant_id, TenantMember.user_id) > last)
+    return stmt
+
+@router.get("/tenants/{tenant_id}/members", response_model=List[TenantMemberResponse])
+async def read_tenant_members(
+    tenant_id: UUID,
+    include_subtree: bool = Query(False, description="Also list members of every descendant tenant"),
+    role_id: Optional[UUID] = Query(None, description="Only members holding this role"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of members to return"),
+    after: Optional[UUID] = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
+    current_user: AuthenticatedUser = Depends(require_permission("user.manage")),
+    db: AsyncSession = Depends(get_tenant_read_db)
+):
+    # Membership of the tenant is checked first, so an unknown tenant is a 403
+    result = await db.execute(tenant_members_query(tenant_id, include_subtree, role_id, after).limit(limit))
+    rows = [dict(row._mapping) for row in result]
+    headers = {NEXT_CURSOR_HEADER: str(rows[-1]["id"])} if len(rows) == limit else None
+    return RowsJSONResponse(TenantMemberResponse, rows, headers=headers)
@@ -1,25 +1,34 @@
-from typing import List, Optional
+import os
+from typing import List, Optional, Tuple
 from uuid import UUID
 from datetime import datetime
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import Text, cast, func, literal_column, select, tuple_
+from sqlalchemy.orm import aliased, selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.base import AsyncSessionLocal
-from app.database.models import User
+from app.core.http_cache import list_validators, not_modified, query_validators, revalidating
+from app.core.serialization import FAST_LIST_RESPONSES, RowsJSONResponse, parse_fields, response_columns, row_adapter, rows_adapter
+from app.database.session import get_read_db
+from app.database.models import User, UserAddress, UserPhoneNumber, UserEmail, TenantMember, Role
 
 router = APIRouter()
 
-# Dependency
-async def get_db():
-    async with AsyncSessionLocal() as db:
-        try:
-            yield db
-        finally:
-            await db.close()
+# Pagination
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+STREAM_CHUNK_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Row path loader: "selectin" runs one query per requested relation, "json_agg"
+# folds them into correlated json_agg subqueries of a single statement on
+# Postgres (other dialects fall back to "selectin")
+USER_LIST_LOADER = os.getenv("USER_LIST_LOADER", "selectin").lower()
+if USER_LIST_LOADER not in ("selectin", "json_agg"):
+    raise ValueError(f"Unknown USER_LIST_LOADER: {USER_LIST_LOADER!r}")
 
 # Pydantic Models
 class UserAddressResponse(BaseModel):
@@ -66,13 +75,216 @@ class UserDetailResponse(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
-@router.get("/users", response_model=List[UserDetailResponse])
-async def read_users(db: AsyncSession = Depends(get_db)):
+# Filtering & sorting
+class UserFilters(BaseModel):
+    email_prefix: Optional[str] = None
+    name: Optional[str] = None
+    tenant_id: Optional[UUID] = None
+    role_id: Optional[UUID] = None
+    role: Optional[str] = None
+    is_active: Optional[bool] = None
+    city: Optional[str] = None
+    country: Optional[str] = None
+    sort: str = "id"
+
+    model_config = ConfigDict(frozen=True)
+
+NO_FILTERS = UserFilters()
+
+# Sort keys; NULL names sort as "" so the keyset comparison stays total. The ''
+# is inlined, not bound, so the expression matches ix_users_full_name_id.
+SORT_KEYS = {
+    "id": lambda user: user.id,
+    "email": lambda user: user.email,
+    "full_name": lambda user: func.coalesce(user.full_name, literal_column("''")),
+    "created_at": lambda user: user.created_at,
+}
+
+def user_filters(
+    email_prefix: Optional[str] = Query(None, description="Case-insensitive email prefix"),
+    name: Optional[str] = Query(None, description="Case-insensitive substring of the full name"),
+    tenant_id: Optional[UUID] = Query(None, description="Members of this tenant"),
+    role_id: Optional[UUID] = Query(None, description="Members holding this role"),
+    role: Optional[str] = Query(None, description="Members holding a role with this name, in any tenant"),
+    is_active: Optional[bool] = Query(None, description="Filter by active flag"),
+    city: Optional[str] = Query(None, description="Users with an address in this city (exact match)"),
+    country: Optional[str] = Query(None, description="Users with an address in this country (exact match)"),
+    sort: str = Query("id", pattern=f"^-?({'|'.join(SORT_KEYS)})$", description="Sort field, prefix with - for descending"),
+) -> UserFilters:
+    return UserFilters(
+        email_prefix=email_prefix, name=name, tenant_id=tenant_id, role_id=role_id, role=role,
+        is_active=is_active, city=city, country=country, sort=sort
+    )
+
+def filter_users(stmt, filters: UserFilters, after: Optional[UUID]):
+    # Each filter has an index behind it: trigram GIN on email/full_name (Postgres),
+    # (tenant_id, role_id, user_id) on tenant_members, (country, city, user_id) on addresses
+    if filters.email_prefix:
+        stmt = stmt.where(User.email.istartswith(filters.email_prefix, autoescape=True))
+    if filters.name:
+        stmt = stmt.where(User.full_name.icontains(filters.name, autoescape=True))
+    if filters.is_active is not None:
+        stmt = stmt.where(User.is_active == filters.is_active)
+    if filters.tenant_id or filters.role_id or filters.role:
+        members = select(TenantMember.user_id)
+        if filters.tenant_id:
+            members = members.where(TenantMember.tenant_id == filters.tenant_id)
+        if filters.role_id:
+            members = members.where(TenantMember.role_id == filters.role_id)
+        if filters.role:
+            members = members.where(TenantMember.role_id.in_(select(Role.id).where(Role.name == filters.role)))
+        stmt = stmt.where(User.id.in_(members))
+    if filters.city or filters.country:
+        addresses = select(UserAddress.user_id)
+        if filters.country:
+            addresses = addresses.where(UserAddress.country == filters.country)
+        if filters.city:
+            addresses = addresses.where(UserAddress.city == filters.city)
+        stmt = stmt.where(User.id.in_(addresses))
+
+    # Keyset pagination on (sort key, id). The cursor stays a plain user id: its
+    # sort key is looked up by primary key, so every sort shares one cursor format.
+    descending = filters.sort.startswith("-")
+    sort_key = SORT_KEYS[filters.sort.lstrip("-")]
+    key = sort_key(User)
+    if after is not None:
+        if filters.sort.lstrip("-") == "id":
+            stmt = stmt.where(User.id < after if descending else User.id > after)
+        else:
+            cursor = aliased(User)
+            last = select(sort_key(cursor), cursor.id).where(cursor.id == after).scalar_subquery()
+            position = tuple_(key, User.id)
+            stmt = stmt.where(position < last if descending else position > last)
+    if filters.sort.lstrip("-") == "id":
+        return stmt.order_by(User.id.desc() if descending else User.id)
+    return stmt.order_by(key.desc(), User.id.desc()) if descending else stmt.order_by(key, User.id)
+
+def users_page_query(after: Optional[UUID], filters: UserFilters = NO_FILTERS):
+    # Keyset pagination on the primary key by default: the index is always there,
+    # ids are unique and the cursor compares the same on every dialect.
     stmt = select(User).options(
         selectinload(User.addresses),
         selectinload(User.phone_numbers),
         selectinload(User.emails)
     )
-    result = await db.execute(stmt)
+    return filter_users(stmt, filters, after)
+
+# Row path: plain column rows, children attached by user id (at most the same
+# four queries as the selectinload path, but no ORM identity map or model
+# validation). With ?fields= only the requested columns and relations are loaded.
+USER_CHILDREN = {
+    "addresses": (UserAddress, UserAddressResponse),
+    "phone_numbers": (UserPhoneNumber, UserPhoneNumberResponse),
+    "emails": (UserEmail, UserEmailResponse),
+}
+
+def aggregated_relation(relation: str):
+    # (SELECT json_agg(json_build_object('id', c.id, ...)) FROM child c WHERE c.user_id = users.id),
+    # cast to text so pydantic-core parses it instead of the driver's json.loads
+    entity, model = USER_CHILDREN[relation]
+    # Keys are inlined: Postgres can't infer a bind parameter's type in json_build_object's variadic "any"
+    row = func.json_build_object(*(arg for column in response_columns(entity, model) for arg in (literal_column(f"'{column.key}'"), column)))
+    return (
+        select(cast(func.coalesce(func.json_agg(row), literal_column("'[]'::json")), Text))
+        .where(entity.user_id == User.id)
+        .scalar_subquery()
+        .label(relation)
+    )
+
+async def load_user_rows(
+    db: AsyncSession, after: Optional[UUID], limit: int, fields: Optional[Tuple[str, ...]] = None,
+    loader: str = USER_LIST_LOADER, filters: UserFilters = NO_FILTERS
+) -> List[dict]:
+    relations = [relation for relation in USER_CHILDREN if fields is None or relation in fields]
+    aggregate = loader == "json_agg" and db.get_bind().dialect.name == "postgresql"
+    # User.id is always selected: it is the cursor and the key children attach to;
+    # so is updated_at, for the listing's ETag. Extra keys aren't serialised, but
+    # go last since pydantic-core writes keys in dict order.
+    columns = response_columns(User, UserDetailResponse, fields)
+    selected = {column.key for column in columns}
+    columns.extend(column for column in (User.id, User.updated_at) if column.key not in selected)
+    if aggregate:
+        columns.extend(aggregated_relation(relation) for relation in relations)
+    stmt = filter_users(select(*columns), filters, after).limit(limit)
+    users = [dict(row._mapping) for row in await db.execute(stmt)]
+
+    if aggregate:
+        # Typed parse of the aggregated JSON gives the same values as the column rows
+        for user in users:
+            for relation in relations:
+                user[relation] = rows_adapter(USER_CHILDREN[relation][1]).validate_json(user[relation])
+        return users
+
+    await attach_user_children(db, users, relations)
+    return users
+
+async def attach_user_children(db: AsyncSession, users: List[dict], relations: List[str]) -> None:
+    # One IN query per relation, appending child rows to the user dicts (keyed by "id")
+    by_id = {}
+    for user in users:
+        user.update((relation, []) for relation in relations)
+        by_id[user["id"]] = user
+    if not by_id:
+        return
+
+    for relation in relations:
+        entity, model = USER_CHILDREN[relation]
+        result = await db.execute(
+            select(entity.user_id, *response_columns(entity, model)).where(entity.user_id.in_(list(by_id)))
+        )
+        for row in result:
+            child = dict(row._mapping)
+            by_id[child.pop("user_id")][relation].append(child)
+
+async def stream_user_rows_ndjson(db: AsyncSession, after: Optional[UUID], fields: Optional[Tuple[str, ...]], filters: UserFilters = NO_FILTERS):
+    # Streams page through the row loader by keyset rather than a yield_per cursor:
+    # SQLAlchemy refuses yield_per with selectinload once a do_orm_execute hook is
+    # registered (the cache and RBAC invalidation hooks are), and only one chunk
+    # is in memory either way
+    adapter = row_adapter(UserDetailResponse, fields)
+    while True:
+        rows = await load_user_rows(db, after, STREAM_CHUNK_SIZE, fields, filters=filters)
+        if not rows:
+            return
+        yield b"".join(adapter.dump_json(row) + b"\n" for row in rows)
+        if len(rows) < STREAM_CHUNK_SIZE:
+            return
+        after = rows[-1]["id"]
+
+@router.get("/users", response_model=List[UserDetailResponse])
+async def read_users(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of users to return"),
+    after: Optional[UUID] = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
+    stream: bool = Query(False, description="Stream every user after the cursor as NDJSON instead of one page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,email,full_name"),
+    filters: UserFilters = Depends(user_filters),
+    db: AsyncSession = Depends(get_read_db)
+):
+    projection = parse_fields(fields, UserDetailResponse)
+    if stream:
+        return StreamingResponse(stream_user_rows_ndjson(db, after, projection, filters), media_type="application/x-ndjson")
+
+    # Conditional GET: one (id, updated_at) pass over the page decides whether
+    # the client's copy is current before anything is loaded or serialised
+    if revalidating(request):
+        stmt = filter_users(select(User.id, User.updated_at), filters, after).limit(limit)
+        if (unchanged := not_modified(request, await query_validators(db, stmt))) is not None:
+            return unchanged
+
+    # Partial rows can't go through the response model, so projections always use the row path
+    if FAST_LIST_RESPONSES or projection is not None or USER_LIST_LOADER == "json_agg":
+        rows = await load_user_rows(db, after, limit, projection, filters=filters)
+        headers = list_validators((row["id"], row["updated_at"]) for row in rows).headers()
+        if len(rows) == limit:
+            headers[NEXT_CURSOR_HEADER] = str(rows[-1]["id"])
+        return RowsJSONResponse(UserDetailResponse, rows, headers=headers, fields=projection)
+
+    result = await db.execute(users_page_query(after, filters).limit(limit))
     users = result.scalars().all()
+    response.headers.update(list_validators((user.id, user.updated_at) for user in users).headers())
+    # A full page means there may be more; the client passes this back as ?after=
+    if len(users) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = str(users[-1].id)
     return users
@@ -0,0 +1,151 @@
+import argparse
+import asyncio
+import logging
+import random
+import time
+import uuid
+from typing import Dict, List
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.database.base import engine, Base
+from app.database.bulk import RowBatch, insert_rows, write_batch
+from app.database.models import (
+    User, UserIdentity, UserAddress, UserPhoneNumber, UserEmail,
+    Tenant, Role, TenantMember, rebuild_tenant_closure
+)
+from app.core.password_hashes import PasswordHashPrecomputer
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Word lists (Faker is far too slow for millions of rows)
+FIRST_NAMES = ["John", "Jane", "Alice", "Bob", "Charlie", "David", "Eve", "Frank", "Grace", "Heidi", "Ivan", "Judy", "Mallory", "Niaj", "Olivia", "Peggy"]
+LAST_NAMES = ["Smith", "Doe", "Johnson", "Brown", "Williams", "Jones", "Miller", "Davis", "Garcia", "Rodriguez", "Wilson", "Martinez"]
+STREETS = ["Main St", "Oak Ave", "Pine Rd", "Maple Dr", "Cedar Ln", "Elm St", "Lake View", "Hill Rd"]
+CITIES = [("Metropolis", "NY", "USA"), ("Springfield", "IL", "USA"), ("Toronto", "ON", "Canada"), ("Berlin", None, "Germany"), ("Kuala Lumpur", None, "Malaysia"), ("Sydney", "NSW", "Australia")]
+ROLE_NAMES = ["admin", "staff", "customer"]
+ROLE_WEIGHTS = [1, 9, 90]
+
+def deterministic_uuid(rng: random.Random) -> uuid.UUID:
+    # Client-side ids: no flush/RETURNING round-trip needed to link child rows
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+def generate_user(batch: RowBatch, rng: random.Random, index: int, tenant_id: uuid.UUID, role_ids: Dict[str, uuid.UUID], password_hash: str) -> None:
+    user_id = deterministic_uuid(rng)
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    email = f"{first.lower()}.{last.lower()}.{index}@example.com"
+
+    batch.add(User.__table__, id=user_id, email=email, full_name=f"{first} {last}", is_active=True, token_version=0)
+    batch.add(UserIdentity.__table__, id=deterministic_uuid(rng), user_id=user_id, provider="local", subject=f"loaduser{index}", password_hash=password_hash)
+
+    role_name = rng.choices(ROLE_NAMES, weights=ROLE_WEIGHTS)[0]
+    batch.add(TenantMember.__table__, id=deterministic_uuid(rng), tenant_id=tenant_id, user_id=user_id, role_id=role_ids[role_name], status="active")
+
+    for i in range(rng.randint(1, 3)):
+        city, state, country = rng.choice(CITIES)
+        batch.add(
+            UserAddress.__table__, id=deterministic_uuid(rng), user_id=user_id,
+            street=f"{rng.randint(1, 9999)} {rng.choice(STREETS)}", city=city, state=state,
+            postal_code=f"{rng.randint(10000, 99999)}", country=country,
+            is_primary=(i == 0), label=rng.choice(["Home", "Work", "Billing"])
+        )
+    for i in range(rng.randint(1, 2)):
+        batch.add(
+            UserPhoneNumber.__table__, id=deterministic_uuid(rng), user_id=user_id,
+            phone_number=f"+1-555-{rng.randint(1000000, 9999999)}", is_primary=(i == 0),
+            label=rng.choice(["Mobile", "Home", "Work"]), is_verified=rng.random() < 0.5
+        )
+    batch.add(UserEmail.__table__, id=deterministic_uuid(rng), user_id=user_id, email=email, is_primary=True, label="Primary", verified_at=None)
+    for i in range(rng.randint(0, 1)):
+        batch.add(
+            UserEmail.__table__, id=deterministic_uuid(rng), user_id=user_id,
+            email=f"{first.lower()}{index}.{i}@mail.example.com", is_primary=False,
+            label=rng.choice(["Personal", "Work", "Recovery"]), verified_at=None
+        )
+
+async def seed_tenant_users(
+    db_engine: AsyncEngine, seed: int, tenant_index: int, tenant_id: uuid.UUID, role_ids: Dict[str, uuid.UUID],
+    first_index: int, count: int, batch_size: int, password: str, hasher: PasswordHashPrecomputer
+) -> int:
+    # One RNG per tenant keeps output identical regardless of concurrency
+    rng = random.Random(f"{seed}:{tenant_index}")
+    created = 0
+    while created < count:
+        batch = RowBatch()
+        indexes = range(first_index + created, first_index + min(created + batch_size, count))
+        # Other tenants keep writing while this batch hashes in the process pool
+        password_hashes = await hasher.hash_all([password] * len(indexes))
+        for index, password_hash in zip(indexes, password_hashes):
+            generate_user(batch, rng, index, tenant_id, role_ids, password_hash)
+        async with db_engine.begin() as conn:
+            await write_batch(conn, batch)
+        created += len(batch)
+    return created
+
+async def seed_bulk(
+    users: int, tenants: int, seed: int, batch_size: int, concurrency: int, password: str,
+    hash_workers: int = None, shared_password_hash: bool = False
+) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        if conn.dialect.name == "sqlite":
+            concurrency = 1  # SQLite serialises writers anyway
+
+    rng = random.Random(seed)
+    tenant_rows, role_rows = [], []
+    role_ids: List[Dict[str, uuid.UUID]] = []
+    for t in range(tenants):
+        tenant_id = deterministic_uuid(rng)
+        tenant_rows.append({"id": tenant_id, "name": f"Load Tenant {t}", "slug": f"load-{seed}-{t}", "parent_tenant_id": None, "is_active": True})
+        roles = {name: deterministic_uuid(rng) for name in ROLE_NAMES}
+        role_ids.append(roles)
+        role_rows.extend(
+            {"id": role_id, "tenant_id": tenant_id, "name": name, "description": f"{name.capitalize()} role", "is_system_role": True}
+            for name, role_id in roles.items()
+        )
+    async with engine.begin() as conn:
+        await insert_rows(conn, Tenant.__table__, tenant_rows)
+        await insert_rows(conn, Role.__table__, role_rows)
+        # Core inserts bypass the ORM hooks that maintain the closure table
+        await conn.run_sync(rebuild_tenant_closure)
+
+    hasher = PasswordHashPrecomputer(workers=hash_workers, shared=shared_password_hash)
+    per_tenant = [users // tenants + (1 if t < users % tenants else 0) for t in range(tenants)]
+    offsets = [sum(per_tenant[:t]) for t in range(tenants)]
+
+    semaphore = asyncio.Semaphore(concurrency)
+    started = time.perf_counter()
+    done = 0
+
+    async def run(t: int) -> None:
+        nonlocal done
+        async with semaphore:
+            done += await seed_tenant_users(
+                engine, seed, t, tenant_rows[t]["id"], role_ids[t], offsets[t], per_tenant[t], batch_size, password, hasher
+            )
+        elapsed = time.perf_counter() - started
+        logger.info(f"Tenant {t + 1}/{tenants} done: {done}/{users} users ({done / elapsed:,.0f} users/s)")
+
+    try:
+        await asyncio.gather(*(run(t) for t in range(tenants)))
+    finally:
+        hasher.close()
+    logger.info(f"✅ Seeded {done} users across {tenants} tenants in {time.perf_counter() - started:.1f}s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a deterministic load-test dataset")
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--tenants", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42, help="Same seed, same rows (run against an empty database)")
+    parser.add_argument("--batch-size", type=int, default=5_000, help="Users per insert transaction")
+    parser.add_argument("--concurrency", type=int, default=4, help="Tenants seeded in parallel (Postgres only)")
+    parser.add_argument("--password", default="password123", help="Password for every loaduser<N> identity")
+    parser.add_argument("--hash-workers", type=int, default=None, help="Password hashing processes (default: all cores)")
+    parser.add_argument("--shared-password-hash", action="store_true", help="Hash the password once and reuse it for every synthetic identity")
+    args = parser.parse_args()
+    asyncio.run(seed_bulk(
+        args.users, args.tenants, args.seed, args.batch_size, args.concurrency, args.password,
+        args.hash_workers, args.shared_password_hash
+    ))
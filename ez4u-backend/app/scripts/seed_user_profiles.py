@@ -1,3 +1,4 @@
+import argparse
 import asyncio
 import logging
 import random
@@ -6,7 +7,7 @@ from faker import Faker
 from sqlalchemy import select
 from app.database.base import AsyncSessionLocal, engine, Base
 from app.database.models import User, UserIdentity, UserAddress, UserPhoneNumber, UserEmail
-from app.core.security import get_password_hash
+from app.core.password_hashes import PasswordHashPrecomputer
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -20,7 +21,7 @@ async def init_db():
         # Create tables if they don't exist
         await conn.run_sync(Base.metadata.create_all)
 
-async def create_random_user(session, index: int):
+async def create_random_user(session, index: int, password_hash: str):
     # 1. Basic User Info
     full_name = fake.name()
     email = fake.unique.email()
@@ -39,7 +40,7 @@ async def create_random_user(session, index: int):
         user_id=user.id,
         provider="local",
         subject=username,
-        password_hash=get_password_hash("password123")
+        password_hash=password_hash
     )
     session.add(identity)
 
@@ -84,7 +85,7 @@ async def create_random_user(session, index: int):
 
     logger.info(f"Created User: {username} ({full_name}) with {num_addresses} addresses, {num_phones} phones")
 
-async def seed_profiles():
+async def seed_profiles(count: int = 10, hash_workers: int = None, shared_password_hash: bool = False):
     await init_db()
     
     async with AsyncSessionLocal() as session:
@@ -96,13 +97,25 @@ async def seed_profiles():
             logger.info("Database already seems populated. Skipping massive seed.")
             return
 
-        logger.info("Seeding 10 random users with complex profiles...")
+        logger.info(f"Seeding {count} random users with complex profiles...")
         
-        for i in range(1, 11):
-            await create_random_user(session, i)
+        # Hash every identity's password up front across all cores
+        hasher = PasswordHashPrecomputer(workers=hash_workers, shared=shared_password_hash)
+        try:
+            password_hashes = await hasher.hash_all(["password123"] * count)
+        finally:
+            hasher.close()
+
+        for i, password_hash in enumerate(password_hashes, start=1):
+            await create_random_user(session, i, password_hash)
         
         await session.commit()
         logger.info("✅ Seeding Complete!")
 
 if __name__ == "__main__":
-    asyncio.run(seed_profiles())
+    parser = argparse.ArgumentParser(description="Seed random users with addresses, phones and emails")
+    parser.add_argument("--count", type=int, default=10)
+    parser.add_argument("--hash-workers", type=int, default=None, help="Password hashing processes (default: all cores)")
+    parser.add_argument("--shared-password-hash", action="store_true", help="Hash the password once and reuse it for every identity")
+    args = parser.parse_args()
+    asyncio.run(seed_profiles(args.count, args.hash_workers, args.shared_password_hash))
@@ -0,0 +1,187 @@
+"""Concurrency benchmarks for the hot API paths.
+
+Boots the FastAPI app in-process (httpx ASGI transport, no network) against a
+freshly seeded SQLite file or a local Postgres, then reports latency
+percentiles, throughput and SQL statements per request for each scenario.
+
+    python -m benchmarks.run                         # SQLite, temp database
+    python -m benchmarks.run --save-baseline         # store results as the baseline
+    python -m benchmarks.run --compare               # exit 1 if queries/request or errors regress
+    python -m benchmarks.run --compare --compare-latency  # also gate p95 (baseline from this machine)
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.run --backend postgres
+
+Postgres runs expect an empty database (the seed writes deterministic rows).
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+SEED_PASSWORD = "password123"
+
+def configure_database(backend: str) -> None:
+    # Must run before anything imports app.database.base
+    # Every simulated client shares one IP, so the login limiter would cap the run
+    os.environ["LOGIN_RATE_LIMIT_ENABLED"] = "False"
+    if backend == "sqlite":
+        os.environ["TEST_MODE"] = "True"
+        path = Path(tempfile.mkdtemp(prefix="ez4u-bench-")) / "bench.db"
+        os.environ["TEST_DATABASE_URL"] = f"sqlite+aiosqlite:///{path}"
+    else:
+        os.environ["TEST_MODE"] = "False"
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    # Nearest-rank percentile
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+class QueryCounter:
+    def __init__(self, sync_engine):
+        from sqlalchemy import event
+        self.count = 0
+        event.listen(sync_engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args) -> None:
+        self.count += 1
+
+class Scenario:
+    def __init__(self, name: str, requests: int, make_request: Callable, expected_status: int = 200):
+        self.name = name
+        self.requests = requests
+        self.make_request = make_request
+        self.expected_status = expected_status
+
+async def run_scenario(client, scenario: Scenario, concurrency: int, counter: QueryCounter) -> Dict[str, float]:
+    latencies: List[float] = []
+    errors = 0
+    queue: asyncio.Queue = asyncio.Queue()
+    for i in range(scenario.requests):
+        queue.put_nowait(i)
+
+    async def worker() -> None:
+        nonlocal errors
+        while not queue.empty():
+            i = queue.get_nowait()
+            started = time.perf_counter()
+            response = await scenario.make_request(client, i)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != scenario.expected_status:
+                errors += 1
+
+    queries_before = counter.count
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": scenario.requests,
+        "errors": errors,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "throughput_rps": scenario.requests / elapsed if elapsed else 0.0,
+        "queries_per_request": (counter.count - queries_before) / scenario.requests,
+    }
+
+async def benchmark(users: int, tenants: int, concurrency: int, requests: int, login_requests: int) -> Dict[str, Dict[str, float]]:
+    import httpx
+    from app.main import app
+    from app.database.base import engine
+    from app.scripts.seed_bulk import seed_bulk
+
+    # Shared hash: argon2 would otherwise dominate seeding time
+    await seed_bulk(users, tenants, seed=42, batch_size=5_000, concurrency=4, password=SEED_PASSWORD, shared_password_hash=True)
+    counter = QueryCounter(engine.sync_engine)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        login = await client.post("/api/login", json={"username": "loaduser0", "password": SEED_PASSWORD})
+        login.raise_for_status()
+        auth = {"Authorization": f"Bearer {login.cookies['access_token']}"}
+
+        scenarios = [
+            Scenario("login", login_requests, lambda c, i: c.post(
+                "/api/login", json={"username": f"loaduser{i % users}", "password": SEED_PASSWORD})),
+            Scenario("me", requests, lambda c, i: c.get("/api/me", headers=auth)),
+            Scenario("users", requests, lambda c, i: c.get("/api/users", params={"limit": 100})),
+            Scenario("tenants", requests, lambda c, i: c.get("/api/tenants")),
+        ]
+        results = {}
+        for scenario in scenarios:
+            # Warm caches and connections so the first scenario isn't penalised
+            await scenario.make_request(client, 0)
+            results[scenario.name] = await run_scenario(client, scenario, concurrency, counter)
+
+    await engine.dispose()
+    return results
+
+def print_results(results: Dict[str, Dict[str, float]]) -> None:
+    print(f"{'scenario':<10}{'reqs':>7}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}{'queries':>9}")
+    for name, r in results.items():
+        print(f"{name:<10}{r['requests']:>7}{r['errors']:>8}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}"
+              f"{r['p99_ms']:>10.2f}{r['throughput_rps']:>10.1f}{r['queries_per_request']:>9.2f}")
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], tolerance: Optional[float] = None) -> List[str]:
+    # Query counts and errors are hardware-independent; p95 is only compared
+    # when a tolerance is given, against a baseline recorded on this machine
+    regressions = []
+    for name, current in results.items():
+        base: Optional[Dict[str, float]] = baseline.get(name)
+        if base is None:
+            continue
+        if tolerance is not None and current["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {current['p95_ms']:.2f}ms vs baseline {base['p95_ms']:.2f}ms")
+        if current["queries_per_request"] > base["queries_per_request"] + 0.01:
+            regressions.append(f"{name}: {current['queries_per_request']:.2f} queries/request vs baseline {base['queries_per_request']:.2f}")
+        if current["errors"] > base["errors"]:
+            regressions.append(f"{name}: {current['errors']} errors vs baseline {base['errors']}")
+    return regressions
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark /api/login, /api/me, /api/users and /api/tenants")
+    parser.add_argument("--backend", choices=["sqlite", "postgres"], default="sqlite")
+    parser.add_argument("--users", type=int, default=5_000)
+    parser.add_argument("--tenants", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=500, help="Requests per scenario")
+    parser.add_argument("--login-requests", type=int, default=20, help="Login is argon2-bound; keep it small")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true", help="Fail if results regress against the stored baseline")
+    parser.add_argument("--compare-latency", action="store_true", help="With --compare, also fail on p95 slowdowns; needs a baseline saved on this machine")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative p95 slowdown with --compare-latency")
+    args = parser.parse_args()
+
+    configure_database(args.backend)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    results = asyncio.run(benchmark(args.users, args.tenants, args.concurrency, args.requests, args.login_requests))
+    print_results(results)
+
+    baseline_path = BASELINE_DIR / f"{args.backend}.json"
+    if args.save_baseline:
+        BASELINE_DIR.mkdir(exist_ok=True)
+        baseline_path.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Baseline saved to {baseline_path}")
+    if args.compare:
+        if not baseline_path.exists():
+            print(f"No baseline at {baseline_path}; run with --save-baseline first")
+            return 1
+        regressions = compare(results, json.loads(baseline_path.read_text()), args.tolerance if args.compare_latency else None)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print("No regressions against baseline")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""CPU cost of serialising user list pages, per 1k users.
+
+Compares FastAPI's default response_model path (validate ORM objects, then
+jsonable_encoder + json.dumps) with the row-based fast path
+(FAST_LIST_RESPONSES) and with ujson/orjson over the same rows. No database
+is involved; the data mirrors what app.scripts.seed_bulk generates.
+
+    python -m benchmarks.serialization --users 1000 --repeat 20
+"""
+import argparse
+import json
+import random
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Callable, List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.core.serialization import rows_adapter
+from app.database.models import User, UserAddress, UserPhoneNumber, UserEmail
+from app.routers.users import UserDetailResponse, USER_CHILDREN
+
+def make_users(count: int) -> List[User]:
+    rng = random.Random(42)
+    now = datetime.now(timezone.utc)
+    users = []
+    for i in range(count):
+        user = User(id=uuid.UUID(int=rng.getrandbits(128)), email=f"user{i}@example.com", full_name=f"User {i}",
+                    is_active=True, created_at=now, updated_at=now)
+        user.addresses = [
+            UserAddress(id=uuid.uuid4(), street=f"{n} Main St", city="Berlin", state=None, postal_code="10115",
+                        country="Germany", is_primary=n == 0, label="Home")
+            for n in range(rng.randint(1, 3))
+        ]
+        user.phone_numbers = [
+            UserPhoneNumber(id=uuid.uuid4(), phone_number=f"+1-555-{rng.randint(1000000, 9999999)}", is_primary=n == 0,
+                            label="Mobile", is_verified=False)
+            for n in range(rng.randint(1, 2))
+        ]
+        user.emails = [UserEmail(id=uuid.uuid4(), email=user.email, is_primary=True, label="Primary", verified_at=None)]
+        users.append(user)
+    return users
+
+def to_rows(users: List[User]) -> List[dict]:
+    # What load_user_rows hands the fast path: plain dicts of response columns
+    def fields(obj, model):
+        return {name: getattr(obj, name) for name in model.model_fields if name not in USER_CHILDREN}
+    return [
+        {**fields(user, UserDetailResponse),
+         **{relation: [fields(child, model) for child in getattr(user, relation)]
+            for relation, (_, model) in USER_CHILDREN.items()}}
+        for user in users
+    ]
+
+def cpu_ms(func: Callable[[], bytes], repeat: int) -> float:
+    func()  # warm-up (schema compilation, caches)
+    started = time.process_time()
+    for _ in range(repeat):
+        func()
+    return (time.process_time() - started) / repeat * 1000
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark list response serialisation")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    users = make_users(args.users)
+    rows = to_rows(users)
+    response_adapter = TypeAdapter(List[UserDetailResponse])
+    row_adapter = rows_adapter(UserDetailResponse)
+
+    def default_path() -> bytes:
+        validated = response_adapter.validate_python(users, from_attributes=True)
+        content = jsonable_encoder(response_adapter.dump_python(validated, mode="json"))
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+    candidates = {
+        "response_model (default)": default_path,
+        "rows + TypeAdapter (fast path)": lambda: row_adapter.dump_json(rows),
+    }
+    try:
+        import ujson
+        candidates["rows + ujson (default=str)"] = lambda: ujson.dumps(rows, default=str).encode()
+    except ImportError:
+        pass
+    try:
+        import orjson
+        candidates["rows + orjson"] = lambda: orjson.dumps(rows)
+    except ImportError:
+        pass
+
+    assert default_path() == row_adapter.dump_json(rows), "fast path output differs from the response model"
+    per_1k = 1000 / args.users
+    print(f"{'path':<34}{'CPU ms / 1k users':>18}")
+    for name, func in candidates.items():
+        print(f"{name:<34}{cpu_ms(func, args.repeat) * per_1k:>18.2f}")
+    print("ujson/orjson format datetimes differently (and ujson needs default=str), so their output is not byte-identical")
+
+if __name__ == "__main__":
+    main()
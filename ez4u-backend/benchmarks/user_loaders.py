@@ -0,0 +1,77 @@
+"""Compare the user list loaders page by page.
+
+    orm       select(User) + three selectinloads, validated through UserDetailResponse
+    selectin  row path, one column query per relation (USER_LIST_LOADER=selectin)
+    json_agg  row path, one statement with json_agg subqueries (USER_LIST_LOADER=json_agg)
+
+Runs against the configured database, seeding it first when --seed-users is
+given (use an empty database), e.g. for the 100k-user comparison:
+
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.user_loaders --seed-users 100000
+    TEST_MODE=True TEST_DATABASE_URL=sqlite+aiosqlite:////tmp/bench.db python -m benchmarks.user_loaders --seed-users 5000
+
+On SQLite json_agg falls back to selectin, so only the Postgres numbers compare the two.
+"""
+import argparse
+import asyncio
+import time
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import TypeAdapter
+
+from app.database.base import AsyncSessionLocal, QueryStats, current_query_stats, engine
+from app.core.serialization import rows_adapter
+from app.routers.users import UserDetailResponse, load_user_rows, users_page_query
+from benchmarks.run import percentile
+
+async def orm_page(db, after: Optional[UUID], limit: int):
+    users = (await db.execute(users_page_query(after).limit(limit))).scalars().all()
+    body = TypeAdapter(List[UserDetailResponse]).dump_json(
+        TypeAdapter(List[UserDetailResponse]).validate_python(users, from_attributes=True)
+    )
+    return (users[-1].id if len(users) == limit else None), body
+
+def row_page(loader: str):
+    async def page(db, after: Optional[UUID], limit: int):
+        rows = await load_user_rows(db, after, limit, loader=loader)
+        return (rows[-1]["id"] if len(rows) == limit else None), rows_adapter(UserDetailResponse).dump_json(rows)
+    return page
+
+async def run_loader(name: str, page, pages: int, limit: int) -> None:
+    timings, statements = [], 0
+    after = None
+    for _ in range(pages):
+        # Fresh session per page, like a request
+        async with AsyncSessionLocal() as db:
+            stats = QueryStats()
+            token = current_query_stats.set(stats)
+            started = time.perf_counter()
+            after, _ = await page(db, after, limit)
+            timings.append(time.perf_counter() - started)
+            current_query_stats.reset(token)
+            statements += stats.count
+        if after is None:
+            break
+    timings.sort()
+    print(f"{name:<10}{len(timings):>7}{percentile(timings, 50) * 1000:>10.2f}{percentile(timings, 95) * 1000:>10.2f}"
+          f"{limit * len(timings) / sum(timings):>12.0f}{statements / len(timings):>10.1f}")
+
+async def main(seed_users: int, pages: int, limit: int) -> None:
+    if seed_users:
+        from app.scripts.seed_bulk import seed_bulk
+        await seed_bulk(seed_users, max(1, seed_users // 1000), seed=42, batch_size=5_000, concurrency=4,
+                        password="password123", shared_password_hash=True)
+    print(f"dialect: {engine.dialect.name}, page size {limit}")
+    print(f"{'loader':<10}{'pages':>7}{'p50 ms':>10}{'p95 ms':>10}{'users/s':>12}{'queries':>10}")
+    for name, page in (("orm", orm_page), ("selectin", row_page("selectin")), ("json_agg", row_page("json_agg"))):
+        await run_loader(name, page, pages, limit)
+    await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the user list loaders")
+    parser.add_argument("--seed-users", type=int, default=0, help="Seed this many users first (empty database only)")
+    parser.add_argument("--pages", type=int, default=50, help="Consecutive keyset pages per loader")
+    parser.add_argument("--limit", type=int, default=100, help="Users per page")
+    args = parser.parse_args()
+    asyncio.run(main(args.seed_users, args.pages, args.limit))
@@ -0,0 +1,46 @@
+"""add tenant closure table
+
+Revision ID: 8c2d4e6f1a3b
+Revises: 3f9a1c2e7b4d
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c2d4e6f1a3b'
+down_revision = '3f9a1c2e7b4d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'tenant_closure',
+        sa.Column('ancestor_id', sa.UUID(), nullable=False),
+        sa.Column('descendant_id', sa.UUID(), nullable=False),
+        sa.Column('depth', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['ancestor_id'], ['tenants.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['descendant_id'], ['tenants.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('ancestor_id', 'descendant_id'),
+    )
+    op.create_index('ix_tenant_closure_descendant_depth', 'tenant_closure', ['descendant_id', 'depth'])
+
+    # Backfill from the existing adjacency list
+    op.execute("""
+        INSERT INTO tenant_closure (ancestor_id, descendant_id, depth)
+        WITH RECURSIVE tree (ancestor_id, descendant_id, depth) AS (
+            SELECT id, id, 0 FROM tenants
+            UNION ALL
+            SELECT tree.ancestor_id, tenants.id, tree.depth + 1
+            FROM tree JOIN tenants ON tenants.parent_tenant_id = tree.descendant_id
+        )
+        SELECT ancestor_id, descendant_id, depth FROM tree
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tenant_closure_descendant_depth', table_name='tenant_closure')
+    op.drop_table('tenant_closure')
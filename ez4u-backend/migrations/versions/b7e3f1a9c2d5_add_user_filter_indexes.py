@@ -0,0 +1,55 @@
+"""add user filter indexes
+
+Revision ID: b7e3f1a9c2d5
+Revises: 8c2d4e6f1a3b
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e3f1a9c2d5'
+down_revision = '8c2d4e6f1a3b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_users_created_at_id', 'users', ['created_at', 'id'])
+    op.create_index('ix_user_addresses_country_city_user', 'user_addresses', ['country', 'city', 'user_id'])
+    op.create_index('ix_user_addresses_city_user', 'user_addresses', ['city', 'user_id'])
+    op.create_index('ix_tenant_members_tenant_role_user', 'tenant_members', ['tenant_id', 'role_id', 'user_id'])
+
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        # CONCURRENTLY can't run inside the migration transaction, but keeps
+        # the users table writable while the GIN indexes build
+        with op.get_context().autocommit_block():
+            op.create_index(
+                'ix_users_email_trgm', 'users', ['email'], postgresql_using='gin',
+                postgresql_ops={'email': 'gin_trgm_ops'}, postgresql_concurrently=True, if_not_exists=True
+            )
+            op.create_index(
+                'ix_users_full_name_trgm', 'users', ['full_name'], postgresql_using='gin',
+                postgresql_ops={'full_name': 'gin_trgm_ops'}, postgresql_concurrently=True, if_not_exists=True
+            )
+            # Keyset order of sort=full_name: the same expression the query sorts on
+            op.create_index(
+                'ix_users_full_name_id', 'users', [sa.text("coalesce(full_name, '')"), 'id'],
+                postgresql_concurrently=True, if_not_exists=True
+            )
+    else:
+        op.create_index('ix_users_full_name_id', 'users', [sa.text("coalesce(full_name, '')"), 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_full_name_id', table_name='users')
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_users_full_name_trgm', table_name='users')
+        op.drop_index('ix_users_email_trgm', table_name='users')
+    op.drop_index('ix_tenant_members_tenant_role_user', table_name='tenant_members')
+    op.drop_index('ix_user_addresses_city_user', table_name='user_addresses')
+    op.drop_index('ix_user_addresses_country_city_user', table_name='user_addresses')
+    op.drop_index('ix_users_created_at_id', table_name='users')
@@ -0,0 +1,24 @@
+"""add tenant members keyset index
+
+Revision ID: d4a8c6e2f0b1
+Revises: b7e3f1a9c2d5
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4a8c6e2f0b1'
+down_revision = 'b7e3f1a9c2d5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_tenant_members_tenant_user', 'tenant_members', ['tenant_id', 'user_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tenant_members_tenant_user', table_name='tenant_members')
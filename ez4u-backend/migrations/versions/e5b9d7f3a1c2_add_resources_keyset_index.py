@@ -0,0 +1,24 @@
+"""add resources keyset index
+
+Revision ID: e5b9d7f3a1c2
+Revises: d4a8c6e2f0b1
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b9d7f3a1c2'
+down_revision = 'd4a8c6e2f0b1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_resources_tenant_id_id', 'resources', ['tenant_id', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_resources_tenant_id_id', table_name='resources')
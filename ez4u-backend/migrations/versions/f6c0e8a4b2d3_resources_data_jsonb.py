@@ -0,0 +1,44 @@
+"""store resources.data as jsonb with a gin index
+
+Revision ID: f6c0e8a4b2d3
+Revises: e5b9d7f3a1c2
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'f6c0e8a4b2d3'
+down_revision = 'e5b9d7f3a1c2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # SQLite keeps JSON text; filters there fall back to json_extract
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.alter_column(
+        'resources', 'data', type_=postgresql.JSONB(), existing_type=sa.JSON(),
+        existing_nullable=True, postgresql_using='data::jsonb'
+    )
+    # autocommit_block commits the type change first: CONCURRENTLY can't run in a
+    # transaction, but keeps resources writable while the GIN index builds
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_resources_data_gin', 'resources', ['data'], postgresql_using='gin',
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_resources_data_gin', table_name='resources')
+    op.alter_column(
+        'resources', 'data', type_=sa.JSON(), existing_type=postgresql.JSONB(),
+        existing_nullable=True, postgresql_using='data::json'
+    )
@@ -36,6 +36,7 @@ async def seed():
             Permission(name="user.manage", category="user_management"),
             Permission(name="data.view", category="data_access"),
             Permission(name="data.export", category="data_access"),
+            Permission(name="data.edit", category="data_access"),
         ]
         session.add_all(perms)
         await session.flush()
@@ -110,6 +111,7 @@ async def seed():
             await session.execute(insert(role_permissions).values(role_id=r_owner.id, permission_id=p_map["tenant.create"].id))
             await session.execute(insert(role_permissions).values(role_id=r_owner.id, permission_id=p_map["tenant.update"].id))
             await session.execute(insert(role_permissions).values(role_id=r_owner.id, permission_id=p_map["user.manage"].id))
+            await session.execute(insert(role_permissions).values(role_id=r_owner.id, permission_id=p_map["data.edit"].id))
             await session.execute(insert(role_permissions).values(role_id=r_customer.id, permission_id=p_map["data.view"].id))
             
             return {"owner": r_owner, "customer": r_customer}
@@ -0,0 +1,56 @@
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core import response_cache
+from app.core.authentication import get_current_user
+from app.core.principal import AuthenticatedUser
+from app.core.response_cache import MemoryResponseCacheBackend
+from app.database.base import Base
+from app.database.session import get_request_db
+from app.routers import auth, exports, imports, resources, tenants, users
+
+@pytest_asyncio.fixture
+async def engine():
+    # A fresh in-memory database per test
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+@pytest_asyncio.fixture
+async def db(engine):
+    # The test's own session for seeding and checking; requests open their own
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+
+@pytest.fixture
+def app(engine, monkeypatch):
+    # The API routers without main.py's middleware. Every request gets one
+    # session on the test database, shared by get_db and get_read_db as in production.
+    monkeypatch.setattr(response_cache, "response_cache", MemoryResponseCacheBackend(maxsize=100, ttl=60))
+    app = FastAPI()
+    for module in (auth, users, tenants, resources, imports, exports):
+        app.include_router(module.router, prefix="/api")
+
+    async def request_db():
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            yield session
+    app.dependency_overrides[get_request_db] = request_db
+    return app
+
+@pytest_asyncio.fixture
+async def client(app):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+@pytest.fixture
+def sign_in(app):
+    # Authenticates the following requests as user, without a token
+    def sign_in(user):
+        principal = AuthenticatedUser(id=user.id, email=user.email, is_active=True)
+        app.dependency_overrides[get_current_user] = lambda: principal
+    return sign_in
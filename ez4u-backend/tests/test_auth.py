@@ -23,3 +23,23 @@ def test_jwt_expiration():
     token = create_access_token(subject=username, expires_delta=timedelta(minutes=1))
     payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     assert payload["sub"] == username
+
+def test_jwt_principal_claims_roundtrip():
+    from uuid import uuid4
+    from app.core.principal import AuthenticatedUser, principal_claims, principal_from_claims
+
+    principal = AuthenticatedUser(
+        id=uuid4(), email="claims@example.com", full_name="Claims User", is_active=True, token_version=3,
+    )
+    token = create_access_token(subject="claims-user", claims=principal_claims(principal))
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    assert payload["sub"] == "claims-user"
+    assert "tenants" not in payload  # Tenant access is checked in the DB, so the cookie stays small
+    assert principal_from_claims(payload) == principal
+
+def test_jwt_without_claims_resolves_via_db():
+    from app.core.principal import principal_from_claims
+
+    token = create_access_token(subject="legacy-user")
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    assert principal_from_claims(payload) is None
@@ -0,0 +1,69 @@
+import csv
+import gzip
+import io
+import json
+import pytest
+import pytest_asyncio
+from sqlalchemy import insert, select
+from app.core import data_export
+from app.database.models import User, UserAddress, UserPhoneNumber, Tenant, TenantMember, Role, Permission, Resource, role_permissions
+
+@pytest_asyncio.fixture
+async def tenant(db, sign_in, monkeypatch):
+    monkeypatch.setattr(data_export, "EXPORT_CHUNK_SIZE", 2)
+    tenant, other = Tenant(name="Acme", slug="acme"), Tenant(name="Other", slug="other")
+    exporter, viewer = Role(tenant=tenant, name="exporter"), Role(tenant=tenant, name="viewer")
+    permission = Permission(name="data.export", category="data_access")
+    users = [User(email=f"user{i}@example.com", full_name=f"User {i}") for i in range(5)]
+    db.add_all([tenant, other, exporter, viewer, permission, *users])
+    await db.flush()
+    await db.execute(insert(role_permissions).values(role_id=exporter.id, permission_id=permission.id))
+    db.add_all([TenantMember(tenant=tenant, user=user, role=exporter if i == 0 else viewer) for i, user in enumerate(users)])
+    db.add_all([
+        UserAddress(user=users[1], street="1 Main St", city="Berlin", postal_code="10115", country="DE", is_primary=True),
+        UserPhoneNumber(user=users[1], phone_number="+49 30 1234", is_primary=True),
+        *(Resource(tenant=tenant, name=f"r{i}", data={"n": i, "tags": ["a", "b"]}) for i in range(5)),
+        Resource(tenant=other, name="elsewhere", data={}),
+    ])
+    await db.commit()
+    sign_in(users[0])  # The exporter
+    return tenant
+
+@pytest.mark.asyncio
+async def test_ndjson_export_streams_every_row_and_resumes_from_a_cursor(client, db, tenant, sign_in):
+    path = f"/api/tenants/{tenant.id}/export/resources"
+    response = await client.get(path, headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200 and response.headers["content-encoding"] == "gzip"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows] == sorted(row["id"] for row in rows)
+    assert {row["name"] for row in rows} == {f"r{i}" for i in range(5)} and rows[0]["data"]["tags"] == ["a", "b"]
+
+    resumed = await client.get(path, params={"after": rows[2]["id"]}, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in resumed.headers
+    assert [json.loads(line)["id"] for line in resumed.text.splitlines()] == [row["id"] for row in rows[3:]]
+
+    users = [json.loads(line) for line in (await client.get(f"/api/tenants/{tenant.id}/export/users")).text.splitlines()]
+    assert len(users) == 5 and {user["role"] for user in users} == {"exporter", "viewer"}
+    assert sum(len(user["addresses"]) for user in users) == 1
+
+    sign_in(await db.scalar(select(User).where(User.email == "user1@example.com")))  # A viewer: no data.export
+    assert (await client.get(path)).status_code == 403
+
+@pytest.mark.asyncio
+async def test_csv_export_flattens_nested_values(client, tenant):
+    response = await client.get(f"/api/tenants/{tenant.id}/export/users", params={"format": "csv"})
+    assert response.headers["content-type"].startswith("text/csv")
+    assert 'filename="users.csv"' in response.headers["content-disposition"]
+    users = {row["email"]: row for row in csv.DictReader(io.StringIO(response.text))}
+    assert len(users) == 5
+    assert users["user1@example.com"]["city"] == "Berlin" and users["user1@example.com"]["phone_number"] == "+49 30 1234"
+    assert users["user2@example.com"]["city"] == "" and users["user0@example.com"]["role"] == "exporter"
+    assert users["user0@example.com"]["is_active"] == "true"
+
+    # Compressed in the body, as a client not decoding Content-Encoding would save it
+    raw = b""
+    async with client.stream("GET", f"/api/tenants/{tenant.id}/export/resources", params={"format": "csv"}, headers={"Accept-Encoding": "gzip"}) as streamed:
+        async for chunk in streamed.aiter_raw():
+            raw += chunk
+    resources = list(csv.DictReader(io.StringIO(gzip.decompress(raw).decode())))
+    assert len(resources) == 5 and json.loads(resources[0]["data"])["tags"] == ["a", "b"]
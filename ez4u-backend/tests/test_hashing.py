@@ -0,0 +1,32 @@
+import asyncio
+import threading
+import pytest
+from app.core.security import get_password_hash
+from app.core.hashing import PasswordHashPool, HashPoolSaturated, verify_password_async, get_password_hash_async
+
+def test_verify_password_async():
+    hashed = get_password_hash("secret")
+    assert asyncio.run(verify_password_async("secret", hashed))
+    assert not asyncio.run(verify_password_async("wrong", hashed))
+
+def test_get_password_hash_async():
+    hashed = asyncio.run(get_password_hash_async("secret"))
+    assert asyncio.run(verify_password_async("secret", hashed))
+
+def test_pool_rejects_when_queue_full():
+    pool = PasswordHashPool(kind="thread", workers=1, queue_limit=1)
+    release = threading.Event()
+
+    async def scenario():
+        # One call occupies the worker, one waits in the queue, the third is shed
+        running = [asyncio.create_task(pool.run("verify", release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+        assert pool.pending == 2
+        with pytest.raises(HashPoolSaturated):
+            await pool.run("verify", release.wait)
+        release.set()
+        await asyncio.gather(*running)
+        assert pool.pending == 0
+
+    asyncio.run(scenario())
+    pool.shutdown()
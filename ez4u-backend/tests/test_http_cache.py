@@ -0,0 +1,47 @@
+from datetime import datetime, timezone
+import pytest
+import pytest_asyncio
+from sqlalchemy import update
+from app.database.models import User, UserAddress, Tenant
+
+BACKDATED = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+@pytest_asyncio.fixture(autouse=True)
+async def seeded(db):
+    db.add_all([Tenant(name="Acme", slug="acme"), User(email="alice@example.com", full_name="Alice")])
+    await db.commit()
+    # Backdate, so the next change is visible at SQLite's one-second timestamp resolution
+    await db.execute(update(User).values(updated_at=BACKDATED))
+    await db.execute(update(Tenant).values(updated_at=BACKDATED))
+    await db.commit()
+
+@pytest.mark.asyncio
+async def test_unchanged_listings_answer_304_until_a_row_changes(client, db):
+    for path in ("/api/users", "/api/tenants"):
+        first = await client.get(path)
+        assert first.status_code == 200 and first.headers["ETag"].startswith('W/"1-')
+        assert first.headers["Last-Modified"] == "Wed, 01 Jan 2020 00:00:00 GMT"
+        cached = await client.get(path, headers={"If-None-Match": first.headers["ETag"]})
+        assert cached.status_code == 304 and cached.content == b""
+        assert cached.headers["ETag"] == first.headers["ETag"]
+
+    etag = (await client.get("/api/tenants")).headers["ETag"]
+    tenant = (await db.execute(Tenant.__table__.select())).first()
+    (await db.get(Tenant, tenant.id)).name = "Acme Corp"  # onupdate bumps updated_at
+    await db.commit()
+    assert (await client.get("/api/tenants", headers={"If-None-Match": etag})).status_code == 200
+
+@pytest.mark.asyncio
+async def test_profile_changes_and_new_rows_change_the_user_etag(client, db):
+    etag = (await client.get("/api/users")).headers["ETag"]
+    alice = (await db.execute(User.__table__.select())).first()
+    db.add(UserAddress(user_id=alice.id, street="1 Main St", city="Berlin", postal_code="10115", country="Germany"))
+    await db.commit()
+    response = await client.get("/api/users", headers={"If-None-Match": etag})
+    assert response.status_code == 200 and response.json()[0]["addresses"][0]["city"] == "Berlin"
+
+    etag = response.headers["ETag"]
+    db.add(User(email="bob@example.com"))
+    await db.commit()
+    response = await client.get("/api/users", headers={"If-None-Match": etag})
+    assert response.status_code == 200 and response.headers["ETag"].startswith('W/"2-')
@@ -0,0 +1,47 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import insert
+from app.database.models import (
+    User, Tenant, Role, TenantMember, GlobalRole, UserGlobalRole, Permission,
+    role_permissions, global_role_permissions
+)
+from app.core.permissions import PermissionRegistry, get_effective_permissions, get_permission_registry
+
+def test_registry_masks_are_compact():
+    registry = PermissionRegistry({1: "data.view", 2: "data.export", 3: "user.manage"})
+    mask = registry.mask(["data.view", "user.manage"])
+    assert sorted(registry.names(mask)) == ["data.view", "user.manage"]
+    assert not mask & registry.bits["data.export"]
+
+@pytest.mark.asyncio
+async def test_effective_permissions_combine_tenant_and_global_roles(db):
+    view, export, manage = (Permission(name=n, category="test") for n in ("data.view", "data.export", "user.manage"))
+    user = User(email="rbac@example.com")
+    tenant = Tenant(name="RBAC", slug="rbac")
+    support, expired = GlobalRole(name="support"), GlobalRole(name="expired")
+    db.add_all([view, export, manage, user, tenant, support, expired])
+    await db.flush()
+    role = Role(tenant_id=tenant.id, name="viewer")
+    db.add(role)
+    await db.flush()
+    membership = TenantMember(tenant_id=tenant.id, user_id=user.id, role_id=role.id)
+    db.add_all([
+        membership,
+        UserGlobalRole(user_id=user.id, global_role_id=support.id, expires_at=datetime.now(timezone.utc) + timedelta(hours=1)),
+        UserGlobalRole(user_id=user.id, global_role_id=expired.id, expires_at=datetime.now(timezone.utc) - timedelta(hours=1)),
+    ])
+    await db.execute(insert(role_permissions).values(role_id=role.id, permission_id=view.id))
+    await db.execute(insert(global_role_permissions).values(global_role_id=support.id, permission_id=export.id))
+    await db.execute(insert(global_role_permissions).values(global_role_id=expired.id, permission_id=manage.id))
+    await db.commit()
+
+    registry = await get_permission_registry(db)
+    in_tenant = await get_effective_permissions(db, user.id, tenant.id)
+    assert sorted(registry.names(in_tenant.mask)) == ["data.export", "data.view"]
+    assert in_tenant.valid_until is not None
+    assert registry.names((await get_effective_permissions(db, user.id, None)).mask) == ["data.export"]
+
+    # Suspending the membership drops the cached tenant grants on commit
+    membership.status = "suspended"
+    await db.commit()
+    assert registry.names((await get_effective_permissions(db, user.id, tenant.id)).mask) == ["data.export"]
@@ -0,0 +1,42 @@
+import time
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from app.core.cache import TTLCache
+from app.core.principal import AuthenticatedUser, principal_cache
+from app.database.base import Base
+from app.database.models import User, UserIdentity
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(maxsize=10, ttl=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+def test_principal_invalidated_when_user_deactivated():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        user = User(email="cache@example.com", full_name="Cache Test", is_active=True)
+        session.add(user)
+        session.flush()
+        session.add(UserIdentity(user_id=user.id, provider="local", subject="cache-test"))
+        session.commit()
+
+        principal_cache.set("cache-test", AuthenticatedUser.model_validate(user))
+        user.is_active = False
+        session.flush()
+        # Not dropped until the transaction commits
+        assert principal_cache.get("cache-test") is not None
+        session.commit()
+        assert principal_cache.get("cache-test") is None
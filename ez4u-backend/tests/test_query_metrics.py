@@ -0,0 +1,39 @@
+import logging
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import text
+from app.core.query_metrics import QueryStatsMiddleware
+from app.database.base import instrument_engine
+
+def make_app(engine, statements: int) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware, headers=True, n_plus_one_threshold=3)
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        async with engine.connect() as conn:
+            for i in range(statements):
+                await conn.execute(text("SELECT :i"), {"i": i})
+        return {"id": item_id}
+
+    return app
+
+async def request(app: FastAPI, path: str) -> httpx.Response:
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        return await client.get(path)
+
+@pytest.mark.asyncio
+async def test_query_stats_headers_count_request_statements(engine):
+    instrument_engine(engine)
+    response = await request(make_app(engine, statements=2), "/items/1")
+    assert response.headers["X-DB-Query-Count"] == "2"
+    assert float(response.headers["X-DB-Time-Ms"]) >= float(response.headers["X-DB-Slowest-Ms"]) > 0
+
+@pytest.mark.asyncio
+async def test_repeated_statement_is_flagged_as_n_plus_one(engine, caplog):
+    instrument_engine(engine)
+    with caplog.at_level(logging.WARNING, logger="app.core.query_metrics"):
+        response = await request(make_app(engine, statements=3), "/items/7")
+    assert response.headers["X-DB-Query-Count"] == "3"
+    assert "Possible N+1 in GET /items/{item_id}: statement ran 3 times" in caplog.text
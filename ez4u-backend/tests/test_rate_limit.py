@@ -0,0 +1,42 @@
+import asyncio
+from app.core import rate_limit
+from app.core.rate_limit import LoginRateLimiter, MemoryRateLimitBackend, RateLimitBackend
+
+def test_buckets_allow_a_burst_then_refill(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    limiter = LoginRateLimiter(MemoryRateLimitBackend(), enabled=True, ip_burst=3, ip_per_minute=60,
+                               username_burst=100, username_per_minute=60)
+
+    async def scenario():
+        assert [await limiter.check("10.0.0.1", f"user{i}") for i in range(3)] == [0, 0, 0]
+        assert await limiter.check("10.0.0.1", "user3") == 1  # One token per second
+        assert await limiter.check("10.0.0.2", "user3") == 0  # Other IPs are unaffected
+        now[0] += 1
+        assert await limiter.check("10.0.0.1", "user4") == 0
+
+    asyncio.run(scenario())
+
+def test_username_bucket_spans_ips_and_case(monkeypatch):
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: 1000.0)
+    backend = MemoryRateLimitBackend()
+    limiter = LoginRateLimiter(backend, enabled=True, ip_burst=1, ip_per_minute=1,
+                               username_burst=2, username_per_minute=6)
+
+    async def scenario():
+        assert await limiter.check("10.0.0.1", "alice") == 0
+        assert await limiter.check("10.0.0.1", "alice") == 60  # IP bucket empty
+        assert await limiter.check("10.0.0.2", "Alice ") == 0  # Rejected IP didn't spend alice's tokens
+        assert await limiter.check("10.0.0.3", "ALICE") == 10
+        assert len(backend) == 4
+
+    asyncio.run(scenario())
+
+def test_backend_failures_fail_open():
+    class Broken(RateLimitBackend):
+        async def take(self, key, capacity, refill_per_second):
+            raise ConnectionError("redis down")
+
+    before = rate_limit.LOGIN_RATE_LIMIT_ERRORS._value.get()
+    assert asyncio.run(LoginRateLimiter(Broken(), enabled=True).check("10.0.0.1", "alice")) == 0
+    assert rate_limit.LOGIN_RATE_LIMIT_ERRORS._value.get() == before + 1
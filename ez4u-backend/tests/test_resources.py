@@ -0,0 +1,97 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import postgresql
+from app.core.data_filters import data_filter_clause, parse_data_filters
+from app.database.models import User, Tenant, TenantMember, Role, Permission, Resource, role_permissions
+
+DOCUMENTS = {
+    "report": {"type": "report", "size": 12, "tags": ["red", "blue"], "owner": {"team": "ops"}},
+    "sheet": {"type": "sheet", "size": 3.5, "tags": ["red"], "draft": True},
+    "note": {"type": "note", "size": "large", "owner": None},
+    "empty": {},
+}
+
+@pytest.mark.asyncio
+async def test_data_filters_on_sqlite(db):
+    tenant = Tenant(name="Acme", slug="acme")
+    db.add_all([tenant, *(Resource(tenant=tenant, name=name, data=data) for name, data in DOCUMENTS.items())])
+    await db.commit()
+
+    async def names(*filters):
+        stmt = select(Resource.name).where(*(
+            data_filter_clause(Resource.data, data_filter, "sqlite") for data_filter in parse_data_filters(list(filters))
+        ))
+        return sorted((await db.execute(stmt)).scalars())
+
+    assert await names("type=report") == ["report"]
+    assert await names("type!=report") == ["empty", "note", "sheet"]
+    assert await names("size>=3.5") == ["report", "sheet"]  # Strings don't compare with numbers
+    assert await names('size>"a"') == ["note"]
+    assert await names('tags=["red"]') == ["report", "sheet"]
+    assert await names('tags=["red","blue"]', "size>5") == ["report"]
+    assert await names('owner={"team":"ops"}') == ["report"]
+    assert await names("owner") == ["note", "report"]  # Key present, even as null
+    assert await names("owner=null") == ["note"]
+    assert await names("draft=true") == ["sheet"]
+    assert await names("owner.team=ops", "tags=red") == []  # A scalar doesn't match an array
+    assert await names('size="12"') == []  # Quoted: the string "12", not the number
+
+def test_filter_parsing_and_postgres_operators():
+    for invalid in ("", "a..b=1", "size>[1]", "size<true", "bad key=1"):
+        with pytest.raises(HTTPException) as exc:
+            parse_data_filters([invalid])
+        assert exc.value.status_code == 400
+    [status, size, tags, owner] = parse_data_filters(["status=active", "specs.size>=10", 'tags=["red"]', "owner"])
+    assert (status.path, status.value, size.path, size.value, tags.value) == (("status",), "active", ("specs", "size"), 10, ["red"])
+
+    def compiled(data_filter):
+        clause = data_filter_clause(Resource.data, data_filter, "postgresql")
+        return str(clause.compile(dialect=postgresql.dialect(), compile_kwargs={"render_postcompile": True}))
+    # Containment and jsonpath operators, which the GIN index serves
+    assert "resources.data @>" in compiled(status) and "resources.data @>" in compiled(tags)
+    assert "@? CAST" in compiled(size) and "@? CAST" in compiled(owner)
+
+@pytest.mark.asyncio
+async def test_resource_crud_and_filtered_listing(db, client, sign_in):
+    tenant, other = Tenant(name="Acme", slug="acme"), Tenant(name="Other", slug="other")
+    editor, viewer = Role(tenant=tenant, name="editor"), Role(tenant=tenant, name="viewer")
+    view, edit = Permission(name="data.view", category="data_access"), Permission(name="data.edit", category="data_access")
+    alice, bob = User(email="alice@example.com"), User(email="bob@example.com")
+    db.add_all([tenant, other, editor, viewer, view, edit, alice, bob, Resource(tenant=other, name="elsewhere", data={"type": "report"})])
+    await db.flush()
+    await db.execute(insert(role_permissions), [
+        {"role_id": editor.id, "permission_id": view.id}, {"role_id": editor.id, "permission_id": edit.id},
+        {"role_id": viewer.id, "permission_id": view.id},
+    ])
+    db.add_all([TenantMember(tenant=tenant, user=alice, role=editor), TenantMember(tenant=tenant, user=bob, role=viewer)])
+    await db.commit()
+
+    sign_in(alice)
+    path = f"/api/tenants/{tenant.id}/resources"
+
+    created = [(await client.post(path, json={"name": name, "data": data})).json() for name, data in DOCUMENTS.items()]
+    assert created[0]["data"] == DOCUMENTS["report"] and created[0]["updated_at"]
+
+    listed = await client.get(path, params={"filter": ['tags=["red"]', "size>3"], "limit": 10})
+    assert sorted(resource["name"] for resource in listed.json()) == ["report", "sheet"]
+    assert listed.headers["ETag"] and "X-Next-Cursor" not in listed.headers
+    assert (await client.get(path, params={"filter": "size>[1]"})).status_code == 400
+    first_page = await client.get(path, params={"limit": 2})
+    rest = await client.get(path, params={"after": first_page.headers["X-Next-Cursor"]})
+    assert len(first_page.json()) + len(rest.json()) == 4  # Not the other tenant's resource
+
+    resource_path = f"{path}/{created[1]['id']}"
+    updated = await client.patch(resource_path, json={"data": {"type": "sheet", "archived": True}})
+    assert updated.json()["name"] == "sheet" and updated.json()["data"] == {"type": "sheet", "archived": True}
+    assert (await client.get(resource_path)).json()["data"]["archived"] is True
+    assert (await client.patch(resource_path, json={"name": None})).status_code == 400
+
+    sign_in(bob)  # data.view only
+    assert (await client.get(resource_path)).status_code == 200
+    assert (await client.delete(resource_path)).status_code == 403
+    sign_in(alice)
+    assert (await client.delete(resource_path)).status_code == 204
+    assert (await client.get(resource_path)).status_code == 404
+    other_resource = await db.scalar(select(Resource.id).where(Resource.tenant_id == other.id))
+    assert (await client.delete(f"{path}/{other_resource}")).status_code == 404
@@ -0,0 +1,74 @@
+import pytest
+from sqlalchemy import event, update
+from app.core import response_cache
+from app.core.response_cache import RESPONSE_CACHE_ERRORS, CachedResponse, MemoryResponseCacheBackend
+from app.database.models import Tenant
+
+@pytest.fixture
+def statements(engine):
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+@pytest.mark.asyncio
+async def test_hits_skip_the_database_until_a_tenant_is_written(client, db, statements):
+    db.add(Tenant(name="Acme", slug="acme"))
+    await db.commit()
+
+    first = await client.get("/api/tenants")
+    statements.clear()
+    second = await client.get("/api/tenants")
+    assert second.content == first.content and second.headers["ETag"] == first.headers["ETag"]
+    revalidated = await client.get("/api/tenants", headers={"If-None-Match": first.headers["ETag"]})
+    assert revalidated.status_code == 304 and statements == []
+    assert (await client.get("/api/tenants?fields=id")).json() == [{"id": first.json()[0]["id"]}]
+    assert statements  # Other query strings are cached separately
+
+    db.add(Tenant(name="Globex", slug="globex"))
+    await db.commit()
+    assert len((await client.get("/api/tenants")).json()) == 2
+
+@pytest.mark.asyncio
+async def test_tenant_list_is_invalidated_by_core_updates(client, db, statements):
+    db.add(Tenant(name="Acme", slug="acme"))
+    await db.commit()
+
+    assert (await client.get("/api/tenants")).json()[0]["name"] == "Acme"
+    await db.execute(update(Tenant).values(name="Acme Corp"))
+    await db.commit()
+    assert (await client.get("/api/tenants")).json()[0]["name"] == "Acme Corp"
+
+    statements.clear()
+    await client.get("/api/tenants")
+    assert statements == []
+
+@pytest.mark.asyncio
+async def test_store_is_skipped_when_a_tag_is_invalidated_during_the_handler():
+    backend = MemoryResponseCacheBackend(maxsize=100, ttl=60)
+    entry = CachedResponse(status_code=200, headers=[], body=b"[]", tags=frozenset({"tenants", "other"}))
+    before = await backend.generations(entry.tags)
+    backend.invalidate({"other"})  # A write commits while the handler is reading
+    await backend.set("key", entry, before)
+    assert await backend.get("key") is None
+    await backend.set("key", entry, await backend.generations(entry.tags))
+    assert await backend.get("key") == entry
+
+class BrokenBackend(MemoryResponseCacheBackend):
+    async def get(self, key):
+        raise ConnectionError("cache down")
+
+    def invalidate(self, tags):
+        raise ConnectionError("cache down")
+
+@pytest.mark.asyncio
+async def test_backend_failures_never_fail_the_request_or_the_commit(client, db, monkeypatch):
+    def errors(operation):
+        return RESPONSE_CACHE_ERRORS.labels(operation)._value.get()
+
+    monkeypatch.setattr(response_cache, "response_cache", BrokenBackend())
+    before = errors("invalidate"), errors("get")
+    db.add(Tenant(name="Acme", slug="acme"))
+    await db.commit()  # Already committed: the failed invalidation is only counted
+    response = await client.get("/api/tenants")
+    assert response.status_code == 200 and len(response.json()) == 1
+    assert (errors("invalidate"), errors("get")) == (before[0] + 1, before[1] + 1)
@@ -0,0 +1,53 @@
+import asyncio
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.database.models import User, UserIdentity, UserAddress, UserPhoneNumber, UserEmail, Tenant, Role, TenantMember
+from app.scripts import seed_bulk
+
+TABLES = (Tenant, Role, User, UserIdentity, TenantMember, UserAddress, UserPhoneNumber, UserEmail)
+
+def seeded(monkeypatch, path):
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        monkeypatch.setattr(seed_bulk, "engine", engine)
+        # 7 users over 2 tenants in batches of 2: uneven split and a partial batch
+        await seed_bulk.seed_bulk(users=7, tenants=2, seed=7, batch_size=2, concurrency=1, password="password123", shared_password_hash=True)
+        async with engine.connect() as conn:
+            ids = {model.__tablename__: (await conn.scalars(select(model.id).order_by(model.id))).all() for model in TABLES}
+            members = (await conn.execute(select(TenantMember.user_id, TenantMember.tenant_id, Role.tenant_id).join(Role, Role.id == TenantMember.role_id))).all()
+            identities = (await conn.execute(select(UserIdentity.user_id, UserIdentity.subject))).all()
+            children = {
+                model.__tablename__: (await conn.execute(select(model.user_id, func.count()).group_by(model.user_id))).all()
+                for model in (UserAddress, UserPhoneNumber, UserEmail)
+            }
+            primary_emails = (await conn.execute(
+                select(User.email, UserEmail.email).join(UserEmail, UserEmail.user_id == User.id).where(UserEmail.is_primary)
+            )).all()
+        await engine.dispose()
+        return ids, members, identities, children, primary_emails
+
+    return asyncio.run(scenario())
+
+def test_same_seed_gives_the_same_linked_rows(monkeypatch, tmp_path):
+    first = seeded(monkeypatch, tmp_path / "first.db")
+    second = seeded(monkeypatch, tmp_path / "second.db")
+    ids, members, identities, children, primary_emails = first
+
+    assert second[0] == ids  # Same ids in every table
+    assert len(ids["users"]) == 7
+    assert len(ids["tenants"]) == 2 and len(ids["roles"]) == 2 * len(seed_bulk.ROLE_NAMES)
+
+    user_ids = set(ids["users"])
+    # One membership and one local identity per user, each pointing at a seeded user;
+    # the member's role belongs to the member's tenant
+    assert sorted(user_id for user_id, _, _ in members) == sorted(user_ids)
+    assert all(tenant_id == role_tenant_id for _, tenant_id, role_tenant_id in members)
+    tenants = [tenant_id for _, tenant_id, _ in members]
+    assert sorted(tenants.count(tenant_id) for tenant_id in set(tenants)) == [3, 4]
+    assert {user_id for user_id, _ in identities} == user_ids
+    assert sorted(subject for _, subject in identities) == sorted(f"loaduser{i}" for i in range(7))
+
+    # Every user has children, and none are orphaned
+    for table, counts in children.items():
+        assert {user_id for user_id, _ in counts} == user_ids, table
+    assert len(primary_emails) == 7 and all(user_email == email for user_email, email in primary_emails)
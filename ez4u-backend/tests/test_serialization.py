@@ -0,0 +1,64 @@
+import json
+from typing import List
+import pytest
+from fastapi import HTTPException
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from app.core.serialization import parse_fields, rows_adapter
+from app.database.base import QueryStats, current_query_stats, instrument_engine
+from app.database.models import User, UserAddress, UserEmail
+from app.routers.users import UserDetailResponse, aggregated_relation, load_user_rows, users_page_query
+
+@pytest.mark.asyncio
+async def test_fast_user_rows_serialise_like_response_model(db):
+    db.add_all([
+        User(email="a@example.com", full_name="A", addresses=[
+            UserAddress(street="1 Main St", city="Berlin", postal_code="10115", country="Germany", is_primary=True)
+        ], emails=[UserEmail(email="a@example.com", is_primary=True)]),
+        User(email="b@example.com"),
+    ])
+    await db.commit()
+
+    users = (await db.execute(users_page_query(None))).scalars().all()
+    default = TypeAdapter(List[UserDetailResponse]).dump_json(
+        TypeAdapter(List[UserDetailResponse]).validate_python(users, from_attributes=True)
+    )
+    fast = rows_adapter(UserDetailResponse).dump_json(await load_user_rows(db, None, 10))
+    assert fast == default
+    assert sorted(len(user["addresses"]) for user in json.loads(fast)) == [0, 1]
+
+def test_parse_fields_orders_and_rejects_unknown():
+    assert parse_fields(None, UserDetailResponse) is None
+    assert parse_fields("full_name, id", UserDetailResponse) == ("id", "full_name")
+    with pytest.raises(HTTPException) as exc:
+        parse_fields("id,password_hash", UserDetailResponse)
+    assert exc.value.status_code == 400
+
+@pytest.mark.asyncio
+async def test_projected_user_rows_skip_unrequested_relations(engine, db):
+    instrument_engine(engine)
+    db.add(User(email="a@example.com", emails=[UserEmail(email="a@example.com", is_primary=True)]))
+    await db.commit()
+
+    stats = QueryStats()
+    token = current_query_stats.set(stats)
+    fields = parse_fields("email,emails", UserDetailResponse)
+    rows = await load_user_rows(db, None, 10, fields)
+    current_query_stats.reset(token)
+    assert stats.count == 2  # users + emails only
+    assert list(json.loads(rows_adapter(UserDetailResponse, fields).dump_json(rows))[0]) == ["email", "emails"]
+
+def test_json_agg_loader_compiles_to_one_correlated_statement():
+    stmt = select(User.id, aggregated_relation("addresses"), aggregated_relation("emails"))
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert sql.count("json_agg(json_build_object('id', user_addresses.id") == 1
+    assert "WHERE user_emails.user_id = users.id" in sql
+    assert sql.rstrip().endswith("FROM users")
+
+@pytest.mark.asyncio
+async def test_json_agg_loader_falls_back_on_sqlite(db):
+    db.add(User(email="a@example.com", emails=[UserEmail(email="a@example.com", is_primary=True)]))
+    await db.commit()
+    rows = await load_user_rows(db, None, 10, loader="json_agg")
+    assert rows[0]["emails"][0]["email"] == "a@example.com"
@@ -0,0 +1,96 @@
+from uuid import uuid4
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from sqlalchemy import insert
+from starlette.requests import Request
+from app.core.principal import AuthenticatedUser, load_principal, principal_claims
+from app.core.security import create_access_token
+from app.core.tenancy import get_tenant_context, membership_cache
+from app.database.models import User, UserIdentity, Tenant, Role, TenantMember, Permission, role_permissions
+
+def make_request(path_params=None, headers=None):
+    scope = {
+        "type": "http",
+        "path_params": path_params or {},
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+    }
+    return Request(scope)
+
+@pytest_asyncio.fixture
+async def membership(db):
+    tenant = Tenant(name="Acme", slug="acme")
+    role = Role(tenant=tenant, name="staff")
+    user = User(email="tenant@example.com")
+    db.add_all([tenant, role, user])
+    await db.flush()
+    member = TenantMember(tenant_id=tenant.id, user_id=user.id, role_id=role.id)
+    db.add(member)
+    await db.commit()
+    return AuthenticatedUser(id=user.id, email=user.email, is_active=True), tenant, member
+
+@pytest.mark.asyncio
+async def test_tenant_context_from_path_membership(db, membership):
+    principal, tenant, member = membership
+    context = await get_tenant_context(make_request(path_params={"tenant_id": str(tenant.id)}), principal, db)
+    assert (context.tenant_id, context.user_id, context.role_id) == (tenant.id, principal.id, member.role_id)
+
+@pytest.mark.asyncio
+async def test_tenant_context_from_header(db, membership):
+    principal, tenant, member = membership
+    context = await get_tenant_context(make_request(headers={"X-Tenant-ID": str(tenant.id)}), principal, db)
+    assert context.tenant_id == tenant.id
+
+@pytest.mark.asyncio
+async def test_tenant_context_rejects_non_members(db, membership):
+    principal, tenant, member = membership
+    with pytest.raises(HTTPException) as exc:
+        await get_tenant_context(make_request(path_params={"tenant_id": str(uuid4())}), principal, db)
+    assert exc.value.status_code == 403
+
+@pytest.mark.asyncio
+async def test_tenant_context_rejects_suspended_members(db, membership):
+    principal, tenant, member = membership
+    member.status = "suspended"
+    await db.commit()
+    with pytest.raises(HTTPException) as exc:
+        await get_tenant_context(make_request(path_params={"tenant_id": str(tenant.id)}), principal, db)
+    assert exc.value.status_code == 403
+
+@pytest.mark.asyncio
+async def test_committed_membership_changes_reach_the_cache(db, membership):
+    principal, tenant, member = membership
+    request = make_request(path_params={"tenant_id": str(tenant.id)})
+    await get_tenant_context(request, principal, db)
+    assert membership_cache.get((principal.id, tenant.id)) == member.role_id
+
+    member.status = "suspended"
+    await db.flush()
+    assert membership_cache.get((principal.id, tenant.id)) == member.role_id  # Not before the commit
+    await db.commit()
+    with pytest.raises(HTTPException) as exc:
+        await get_tenant_context(request, principal, db)
+    assert exc.value.status_code == 403
+
+@pytest.mark.asyncio
+async def test_removed_member_loses_access_with_an_old_token(db, client):
+    tenant = Tenant(name="Acme", slug="acme")
+    role = Role(tenant=tenant, name="viewer")
+    view = Permission(name="data.view", category="data_access")
+    user = User(email="leaver@example.com")
+    db.add_all([tenant, role, view, user, UserIdentity(user=user, provider="local", subject="leaver")])
+    await db.flush()
+    await db.execute(insert(role_permissions), [{"role_id": role.id, "permission_id": view.id}])
+    member = TenantMember(tenant=tenant, user=user, role=role)
+    db.add(member)
+    await db.commit()
+    # Issued while a member
+    token = create_access_token(subject="leaver", claims=principal_claims(await load_principal(db, "leaver")))
+    client.headers["Authorization"] = f"Bearer {token}"
+    path = f"/api/tenants/{tenant.id}/resources"
+    assert (await client.get(path)).status_code == 200
+
+    await db.delete(member)
+    await db.commit()
+    # Same token, no re-login: the membership is checked in the DB
+    assert (await client.get(path)).status_code == 403
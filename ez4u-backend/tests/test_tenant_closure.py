@@ -0,0 +1,52 @@
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+from app.database.base import Base
+from app.database.models import Tenant, tenant_closure, rebuild_tenant_closure
+
+def closure_rows(session):
+    return set(session.execute(select(tenant_closure)).all())
+
+def make_session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    return Session(engine)
+
+def test_closure_tracks_inserts_and_moves():
+    with make_session() as session:
+        root = Tenant(name="Root", slug="root")
+        other = Tenant(name="Other", slug="other")
+        session.add_all([root, other])
+        session.flush()
+        child = Tenant(name="Child", slug="child", parent_tenant_id=root.id)
+        session.add(child)
+        session.flush()
+        grandchild = Tenant(name="Grandchild", slug="grandchild", parent_tenant_id=child.id)
+        session.add(grandchild)
+        session.commit()
+
+        assert (root.id, grandchild.id, 2) in closure_rows(session)
+
+        # Move the child subtree under "other"
+        child.parent_tenant_id = other.id
+        session.commit()
+        rows = closure_rows(session)
+        assert (other.id, grandchild.id, 2) in rows
+        assert not any(r.ancestor_id == root.id and r.descendant_id != root.id for r in rows)
+
+        # Incremental maintenance matches a full rebuild
+        rebuild_tenant_closure(session.connection())
+        assert closure_rows(session) == rows
+
+def test_closure_rejects_cycles():
+    with make_session() as session:
+        root = Tenant(name="Root", slug="root")
+        session.add(root)
+        session.flush()
+        child = Tenant(name="Child", slug="child", parent_tenant_id=root.id)
+        session.add(child)
+        session.commit()
+
+        root.parent_tenant_id = child.id
+        with pytest.raises(ValueError):
+            session.flush()
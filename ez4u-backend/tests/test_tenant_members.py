@@ -0,0 +1,73 @@
+import uuid
+import pytest
+import pytest_asyncio
+from sqlalchemy import insert, select
+from app.database.models import User, Tenant, Role, TenantMember, Permission, role_permissions
+from app.routers.tenants import tenant_members_query
+
+@pytest_asyncio.fixture
+async def tenants(db):
+    root = Tenant(name="Acme", slug="acme")
+    branch = Tenant(name="Acme Berlin", slug="acme-berlin", parent=root)
+    other = Tenant(name="Other", slug="other")
+    admin = Role(tenant=root, name="admin")
+    staff = Role(tenant=branch, name="staff")
+    users = [User(email=f"user{i}@example.com", full_name=f"User {i}") for i in range(4)]
+    db.add_all([root, branch, other, admin, staff, *users])
+    await db.flush()
+    db.add_all([
+        TenantMember(tenant_id=root.id, user_id=users[0].id, role_id=admin.id),
+        TenantMember(tenant_id=branch.id, user_id=users[0].id, role_id=staff.id),
+        TenantMember(tenant_id=branch.id, user_id=users[1].id, role_id=staff.id),
+        TenantMember(tenant_id=branch.id, user_id=users[2].id, role_id=staff.id),
+        TenantMember(tenant_id=other.id, user_id=users[3].id, role_id=admin.id),
+    ])
+    await db.commit()
+    return root, branch, staff
+
+async def members(db, tenant_id, include_subtree=False, role_id=None, after=None, limit=100):
+    result = await db.execute(tenant_members_query(tenant_id, include_subtree, role_id, after).limit(limit))
+    return [dict(row._mapping) for row in result]
+
+@pytest.mark.asyncio
+async def test_members_are_scoped_to_the_tenant_or_its_subtree(db, tenants):
+    root, branch, staff = tenants
+    direct = await members(db, root.id)
+    assert [(row["email"], row["role_name"]) for row in direct] == [("user0@example.com", "admin")]
+    subtree = await members(db, root.id, include_subtree=True)
+    assert len(subtree) == 4  # user0 once per membership, user3 belongs to another tenant
+    assert {row["tenant_id"] for row in subtree} == {root.id, branch.id}
+    assert len(await members(db, root.id, include_subtree=True, role_id=staff.id)) == 3
+    assert await members(db, uuid.uuid4(), include_subtree=True) == []
+
+@pytest.mark.asyncio
+async def test_keyset_pages_match_a_single_page(db, tenants):
+    root, branch, staff = tenants
+    whole = await members(db, root.id, include_subtree=True)
+    paged, after = [], None
+    while rows := await members(db, root.id, include_subtree=True, after=after, limit=1):
+        paged += rows
+        after = rows[-1]["id"]
+    assert [row["id"] for row in paged] == [row["id"] for row in whole]
+
+@pytest.mark.asyncio
+async def test_members_need_user_manage_and_roles_need_membership(db, tenants, client, sign_in):
+    root, branch, staff = tenants
+    manage = Permission(name="user.manage", category="user_management")
+    db.add(manage)
+    await db.flush()
+    admin = await db.scalar(select(Role).where(Role.tenant_id == root.id))
+    await db.execute(insert(role_permissions), [{"role_id": admin.id, "permission_id": manage.id}])
+    await db.commit()
+    users = {user.email: user for user in (await db.scalars(select(User))).all()}
+
+    sign_in(users["user0@example.com"])  # admin of root
+    response = await client.get(f"/api/tenants/{root.id}/members", params={"include_subtree": "true"})
+    assert response.status_code == 200 and len(response.json()) == 4
+    assert (await client.get(f"/api/tenants/{uuid.uuid4()}/members")).status_code == 403
+    sign_in(users["user1@example.com"])  # staff of branch, without user.manage
+    assert (await client.get(f"/api/tenants/{branch.id}/members")).status_code == 403
+    assert (await client.get(f"/api/tenants/{root.id}/members")).status_code == 403
+    roles = await client.get(f"/api/tenants/{branch.id}/roles")
+    assert roles.status_code == 200 and [role["name"] for role in roles.json()] == ["staff"]
+    assert (await client.get(f"/api/tenants/{root.id}/roles")).status_code == 403
@@ -0,0 +1,55 @@
+import asyncio
+import httpx
+import pytest
+from fastapi import FastAPI
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.core import hashing, security, tracing
+from app.core.hashing import PasswordHashPool
+from app.core.security import verify_password, get_password_hash
+from app.core.tracing import TracingMiddleware
+from app.database import base
+from app.database.base import instrument_engine
+
+@pytest.fixture
+def exporter(monkeypatch):
+    # Swap the modules' tracers for ones from a private provider: the global
+    # provider can only be set once per process, and would leak into other tests
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    for module, name in ((tracing, "ez4u"), (base, "ez4u.database"), (hashing, "ez4u.hashing"), (security, "ez4u.security")):
+        monkeypatch.setattr(module, "tracer", provider.get_tracer(name))
+    yield exporter
+    provider.shutdown()
+
+def test_request_span_parents_db_and_password_spans(exporter):
+    engine = create_async_engine("sqlite+aiosqlite://")
+    instrument_engine(engine)
+    pool = PasswordHashPool(kind="thread", workers=1)
+    password_hash = get_password_hash("secret")
+    app = FastAPI()
+    app.add_middleware(TracingMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        return {"valid": await pool.run("verify", verify_password, "secret", password_hash)}
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await client.get("/items/1")
+
+    assert asyncio.run(scenario()).json() == {"valid": True}
+    pool.shutdown()
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    server = spans["GET /items/{item_id}"]
+    assert server.attributes["http.response.status_code"] == 200
+    assert spans["SELECT"].parent.span_id == server.context.span_id
+    assert spans["password_hash_pool.verify"].parent.span_id == server.context.span_id
+    assert spans["password.verify"].parent.span_id == spans["password_hash_pool.verify"].context.span_id
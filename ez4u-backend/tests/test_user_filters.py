@@ -0,0 +1,48 @@
+import pytest
+import pytest_asyncio
+from app.database.models import User, UserAddress, Tenant, Role, TenantMember
+from app.routers.users import UserFilters, load_user_rows
+
+@pytest_asyncio.fixture
+async def tenant(db):
+    tenant = Tenant(name="Acme", slug="acme")
+    admin = Role(tenant=tenant, name="admin")
+    staff = Role(tenant=tenant, name="staff")
+    users = [
+        User(email="alice@example.com", full_name="Alice Smith", addresses=[
+            UserAddress(street="1 Main St", city="Berlin", postal_code="10115", country="Germany")]),
+        User(email="bob@example.com", full_name="Bob Jones", is_active=False),
+        User(email="carol@example.com", full_name=None),
+        User(email="al.b@example.com", full_name="Albert Smithers"),
+    ]
+    db.add_all([tenant, admin, staff, *users])
+    await db.flush()
+    db.add_all([
+        TenantMember(tenant_id=tenant.id, user_id=users[0].id, role_id=admin.id),
+        TenantMember(tenant_id=tenant.id, user_id=users[1].id, role_id=staff.id),
+    ])
+    await db.commit()
+    return tenant
+
+async def emails(db, **filters):
+    return [row["email"] for row in await load_user_rows(db, None, 100, ("email",), filters=UserFilters(**filters))]
+
+@pytest.mark.asyncio
+async def test_filters_combine_user_membership_and_address_conditions(db, tenant):
+    assert sorted(await emails(db, email_prefix="AL")) == ["al.b@example.com", "alice@example.com"]
+    assert sorted(await emails(db, name="smith")) == ["al.b@example.com", "alice@example.com"]
+    assert await emails(db, tenant_id=tenant.id, role="admin") == ["alice@example.com"]
+    assert await emails(db, tenant_id=tenant.id, is_active=False) == ["bob@example.com"]
+    assert await emails(db, country="Germany", city="Berlin") == ["alice@example.com"]
+    assert await emails(db, email_prefix="%") == []  # LIKE wildcards are escaped
+
+@pytest.mark.asyncio
+async def test_sorted_keyset_pages_match_a_single_page(db, tenant):
+    filters = UserFilters(sort="-full_name")
+    whole = [row["email"] for row in await load_user_rows(db, None, 100, ("email",), filters=filters)]
+    paged, after = [], None
+    while rows := await load_user_rows(db, after, 1, ("email",), filters=filters):
+        paged += [row["email"] for row in rows]
+        after = rows[-1]["id"]
+    assert paged == whole
+    assert whole[0] == "bob@example.com" and whole[-1] == "carol@example.com"  # NULL name sorts as ""
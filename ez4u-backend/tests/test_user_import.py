@@ -0,0 +1,82 @@
+import io
+import json
+import uuid
+from datetime import datetime, timezone
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+from app.core import user_import
+from app.core.security import verify_password
+from app.core.user_import import ImportJob, run_import
+from app.database.models import User, UserIdentity, UserAddress, UserPhoneNumber, UserEmail, Tenant, Role, TenantMember
+from app.core.password_hashes import PasswordHashPrecomputer
+
+@pytest.fixture(autouse=True)
+def import_settings(monkeypatch):
+    # Shared hashes go through the app's thread pool: no worker processes to fork in tests
+    monkeypatch.setattr(user_import, "import_hasher", PasswordHashPrecomputer(shared=True))
+    monkeypatch.setattr(user_import, "IMPORT_BATCH_SIZE", 2)
+
+@pytest_asyncio.fixture
+async def run_import_of(engine, db):
+    tenant = Tenant(name="Acme", slug="acme")
+    db.add_all([tenant, Role(tenant=tenant, name="customer"), Role(tenant=tenant, name="staff"),
+                User(email="taken@example.com")])
+    await db.commit()
+
+    async def run_import_of(format, body: bytes) -> ImportJob:
+        job = ImportJob(id=uuid.uuid4(), tenant_id=tenant.id, format=format, created_at=datetime.now(timezone.utc))
+        await run_import(job, io.BytesIO(body), db_engine=engine)
+        return job
+    return run_import_of
+
+@pytest.mark.asyncio
+async def test_ndjson_import_creates_users_and_reports_bad_rows(db, run_import_of):
+    lines = [
+        {"email": "alice@example.com", "full_name": "Alice", "username": "alice", "password": "s3cret", "role": "staff",
+         "addresses": [{"street": "1 Main St", "city": "Berlin", "postal_code": "10115", "country": "Germany", "is_primary": True}],
+         "phone_numbers": [{"phone_number": "+49 30 1234", "is_primary": True}],
+         "emails": [{"email": "alice@work.example.com", "label": "Work"}]},
+        {"email": "bob@example.com"},
+        {"email": "not-an-email"},
+        {"email": "carol@example.com", "role": "owner"},
+        {"email": "taken@example.com"},
+        {"email": "bob2@example.com", "username": "alice"},
+    ]
+    body = "\n".join(json.dumps(line) for line in lines).encode() + b"\n{broken\n"
+
+    job = await run_import_of("ndjson", body)
+    assert job.status == "completed"
+    assert (job.rows_read, job.rows_imported, job.rows_failed) == (7, 2, 5)
+    errors = {error.line: error.error for error in job.errors}
+    assert sorted(errors) == [3, 4, 5, 6, 7]
+    assert errors[3].startswith("email:") and "unknown role 'owner'" in errors[4]
+    assert "already exists" in errors[5] and "already exists" in errors[6]  # alice was imported by an earlier batch
+    assert errors[7].startswith("Invalid JSON")
+
+    identity = (await db.execute(select(UserIdentity).where(UserIdentity.subject == "alice"))).scalar_one()
+    assert verify_password("s3cret", identity.password_hash)
+    bob = (await db.execute(select(UserIdentity).where(UserIdentity.subject == "bob@example.com"))).scalar_one()
+    assert bob.password_hash is None
+    counts = [await db.scalar(select(func.count()).select_from(model)) for model in (UserAddress, UserPhoneNumber, UserEmail, TenantMember)]
+    assert counts == [1, 1, 3, 2]  # Primary email rows for alice and bob, plus alice's work address
+    role = await db.scalar(select(Role.name).join(TenantMember, TenantMember.role_id == Role.id).where(TenantMember.user_id == identity.user_id))
+    assert role == "staff"
+
+@pytest.mark.asyncio
+async def test_csv_columns_map_to_primary_address_and_phone(db, run_import_of):
+    body = (
+        "email,full_name,street,city,state,postal_code,country,phone_number,is_active\n"
+        "dave@example.com,Dave,2 High St,London,,SW1A 1AA,UK,+44 20 1234,false\n"
+        "erin@example.com,Erin,,,,,,,\n"
+        "frank@example.com,Frank,3 Side St,Paris\n"
+    ).encode()
+
+    job = await run_import_of("csv", body)
+    assert (job.rows_imported, job.rows_failed) == (2, 1)
+    assert job.errors[0].line == 4 and "addresses.0.postal_code" in job.errors[0].error
+    dave = (await db.execute(select(User).where(User.email == "dave@example.com"))).scalar_one()
+    assert dave.is_active is False
+    address = (await db.execute(select(UserAddress))).scalar_one()
+    assert (address.user_id, address.city, address.state, address.is_primary) == (dave.id, "London", None, True)
+    assert await db.scalar(select(UserPhoneNumber.phone_number)) == "+44 20 1234"
@@ -0,0 +1,51 @@
+import json
+import pytest
+import pytest_asyncio
+from app.database.models import User, UserAddress, UserEmail
+from app.routers import users
+
+@pytest_asyncio.fixture
+async def ids(db):
+    people = [User(email=f"user{i}@example.com", full_name=f"User {i}") for i in range(5)]
+    db.add_all(people)
+    await db.flush()
+    db.add_all([
+        UserAddress(user_id=people[0].id, street="1 Main St", city="Berlin", postal_code="10115", country="DE", is_primary=True),
+        UserEmail(user_id=people[0].id, email="work0@example.com", is_primary=False),
+    ])
+    await db.commit()
+    return sorted(str(person.id) for person in people)
+
+@pytest.mark.asyncio
+async def test_keyset_pages_cover_every_user_once(client, ids):
+    pages, after = [], None
+    while True:
+        response = await client.get("/api/users", params={"limit": 2, **({"after": after} if after else {})})
+        pages.append([user["id"] for user in response.json()])
+        after = response.headers.get(users.NEXT_CURSOR_HEADER)
+        if after is None:
+            break
+        assert after == pages[-1][-1]  # The cursor is the last id of the page
+    assert [len(page) for page in pages] == [2, 2, 1]  # A short page is the last one
+    assert [user_id for page in pages for user_id in page] == ids  # Ordered by id, no overlap, no gaps
+
+    # A full last page still carries a cursor; following it yields an empty page
+    full = await client.get("/api/users", params={"limit": 5})
+    assert full.headers[users.NEXT_CURSOR_HEADER] == ids[-1]
+    empty = await client.get("/api/users", params={"after": ids[-1]})
+    assert empty.json() == [] and users.NEXT_CURSOR_HEADER not in empty.headers
+
+@pytest.mark.asyncio
+async def test_stream_returns_ndjson_after_the_cursor(client, ids):
+    response = await client.get("/api/users", params={"stream": "true"})
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    streamed = [json.loads(line) for line in response.text.splitlines()]
+    assert [user["id"] for user in streamed] == ids
+    with_profile = next(user for user in streamed if user["email"] == "user0@example.com")
+    assert [address["city"] for address in with_profile["addresses"]] == ["Berlin"]
+    assert [email["email"] for email in with_profile["emails"]] == ["work0@example.com"]
+
+    resumed = await client.get("/api/users", params={"stream": "true", "after": ids[1]})
+    assert [json.loads(line)["id"] for line in resumed.text.splitlines()] == ids[2:]
+    projected = await client.get("/api/users", params={"stream": "true", "fields": "id,email"})
+    assert [sorted(json.loads(line)) for line in projected.text.splitlines()] == [["email", "id"]] * 5
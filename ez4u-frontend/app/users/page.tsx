@@ -102,6 +102,23 @@ interface User {
 
 type DirectoryItem = Tenant | User;
 
+// --- API ---
+
+// /api/users is keyset-paginated: follow X-Next-Cursor until the last page
+const fetchAllUsers = async <T,>(query: Record<string, string> = {}): Promise<T[]> => {
+  const rows: T[] = [];
+  let after: string | null = null;
+  do {
+    const params = new URLSearchParams({ ...query, limit: '1000' });
+    if (after) params.set('after', after);
+    const res = await fetch(`/api/users?${params}`);
+    if (!res.ok) throw new Error('Failed to fetch users');
+    rows.push(...(await res.json()));
+    after = res.headers.get('X-Next-Cursor');
+  } while (after);
+  return rows;
+};
+
 // --- Components ---
 
 const DetailSheet = ({ item, open, onOpenChange }: { item: DirectoryItem | null, open: boolean, onOpenChange: (open: boolean) => void }) => {
@@ -261,9 +278,7 @@ export default function UsersPage() {
       // Assuming we only show users if we are inside a tenant
       let formattedUsers: User[] = [];
       if (parentId) {
-         const usersRes = await fetch(`/api/users?tenant_id=${parentId}`);
-         if (!usersRes.ok) throw new Error('Failed to fetch users');
-         const usersData: User[] = await usersRes.json();
+         const usersData = await fetchAllUsers<User>({ tenant_id: parentId });
          formattedUsers = usersData.map(u => ({ ...u, type: 'user' as const }));
       }
 
@@ -287,11 +302,9 @@ export default function UsersPage() {
     // Fetch total global user count for the Root label
     const fetchTotalUsers = async () => {
       try {
-        const res = await fetch('/api/users');
-        if (res.ok) {
-          const data = await res.json();
-          setTotalUsers(data.length);
-        }
+        // Only ids: the count needs every page, not the full user records
+        const ids = await fetchAllUsers<{ id: string }>({ fields: 'id' });
+        setTotalUsers(ids.length);
       } catch (error) {
         console.error("Failed to fetch total user count", error);
       }